@@ -1,9 +1,9 @@
+import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_login import LoginManager
 from config import Config
-from app.extensions import db, migrate, login
+from app.extensions import db, login, instrumentation, sqlite_pragmas, password_hasher, template_cache, static_assets, compression
 
 def create_app(config_class=Config):
     app = Flask(__name__)
@@ -11,8 +11,19 @@ def create_app(config_class=Config):
 
     # Initialize Flask extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    sqlite_pragmas.init_app(app)
     login.init_app(app)
+    instrumentation.init_app(app)
+    password_hasher.init_app(app)
+    template_cache.init_app(app)
+    static_assets.init_app(app)
+    compression.init_app(app)
+
+    # Flask-Migrate imports Alembic and Mako, which only the `flask db` commands
+    # use, so workers started outside the flask CLI skip loading them
+    if os.environ.get('FLASK_RUN_FROM_CLI'):
+        from flask_migrate import Migrate
+        Migrate(app, db)
 
     # Register blueprints
     from app.main import bp as main_bp
@@ -33,6 +44,18 @@ def create_app(config_class=Config):
     from app.admin import bp as admin_bp
     app.register_blueprint(admin_bp, url_prefix='/admin')
 
+    from app.data import bp as data_bp
+    app.register_blueprint(data_bp, url_prefix='/data')
+
+    from app.replica import replica_cli
+    app.cli.add_command(replica_cli)
+
+    from app.templating import templates_cli
+    app.cli.add_command(templates_cli)
+
+    from app.assets import assets_cli
+    app.cli.add_command(assets_cli)
+
     return app
 
 from app import models
\ No newline at end of file
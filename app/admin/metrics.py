@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, select
+from app.extensions import db
+from app.cache import app_cache
+from app.models import User, WeightEntry, CalorieEntry, FastingSession, WeightGoal
+from app.replica import replica_reads
+
+# (label, model, timestamp column) for the per-table and per-day metrics
+METRIC_TABLES = (
+    ('Users', User, None),
+    ('Weight entries', WeightEntry, WeightEntry.date),
+    ('Food entries', CalorieEntry, CalorieEntry.date),
+    ('Fasting sessions', FastingSession, FastingSession.start_time),
+    ('Weight goals', WeightGoal, None)
+)
+
+def metrics_cache():
+    """Per-app cache holding the most recently computed platform metrics."""
+    return app_cache('admin_metrics_cache', None, 'ADMIN_METRICS_CACHE_TTL')
+
+def count_users_by_role():
+    """Return (total, admins, regular) from a single grouped COUNT."""
+    counts = dict(db.session.execute(
+        select(User.is_admin, func.count(User.id)).group_by(User.is_admin)
+    ).all())
+    admins = counts.get(True, 0)
+    total = sum(counts.values())
+    return total, admins, total - admins
+
+def entries_per_day(days):
+    """Entries logged per day over the last `days` days, summed across tracked tables."""
+    first_day = datetime.utcnow().date() - timedelta(days=days - 1)
+    since = datetime.combine(first_day, datetime.min.time())
+    totals = {first_day + timedelta(days=offset): 0 for offset in range(days)}
+    for _, model, column in METRIC_TABLES:
+        if column is None:
+            continue
+        day = func.date(column)
+        for value, count in db.session.execute(
+            select(day, func.count()).where(column >= since).group_by(day)
+        ):
+            value = datetime.strptime(value, '%Y-%m-%d').date() if isinstance(value, str) else value
+            if value in totals:
+                totals[value] += count
+    return sorted(totals.items())
+
+@replica_reads()
+def compute_platform_metrics():
+    now = datetime.utcnow()
+    total, admins, regular = count_users_by_role()
+    return {
+        'total_users': total,
+        'admin_users': admins,
+        'regular_users': regular,
+        'table_counts': [
+            (label, db.session.scalar(select(func.count()).select_from(model)))
+            for label, model, _ in METRIC_TABLES
+        ],
+        'active_users': [
+            (days, db.session.scalar(select(func.count(User.id)).where(User.last_login >= now - timedelta(days=days))))
+            for days in (7, 30)
+        ],
+        'entries_per_day': entries_per_day(current_app.config['ADMIN_METRICS_DAYS']),
+        'computed_at': now
+    }
+
+def platform_metrics():
+    """Return the cached platform metrics, recomputing them once the TTL has passed."""
+    cache = metrics_cache()
+    metrics = cache.get('platform')
+    if metrics is None:
+        metrics = compute_platform_metrics()
+        cache.set('platform', metrics)
+    return metrics
@@ -1,9 +1,13 @@
-from flask import render_template, redirect, url_for, flash, request, abort
+from flask import render_template, redirect, url_for, flash, request, abort, current_app
 from flask_login import login_required, current_user
 from app import db
 from app.admin import bp
 from app.admin.forms import CreateUserForm, EditUserForm, ChangePasswordForm, AdminPasswordChangeForm
-from app.models import User
+from app.models import User, DailyNutrition, FastingState, FoodCatalog, WeightForecast
+from app.admin.metrics import platform_metrics, metrics_cache
+from app.pagination import id_keyset_page, fragment_response
+from app.identity import invalidate_identity
+from app.weight.trend import trend_cache
 from datetime import datetime
 from functools import wraps
 
@@ -19,25 +23,31 @@ def admin_required(f):
 @login_required
 @admin_required
 def dashboard():
-    users = User.query.all()
-    total_users = len(users)
-    admin_users = len([u for u in users if u.is_admin])
-    regular_users = total_users - admin_users
-    
+    # Counts come from aggregate queries cached for a short TTL, never from loading users
+    metrics = platform_metrics()
+    recent_users = User.query.order_by(User.id.desc()).limit(5).all()[::-1]
+
     return render_template('admin/dashboard.html', 
-                         users=users,
-                         total_users=total_users,
-                         admin_users=admin_users,
-                         regular_users=regular_users)
+                         recent_users=recent_users,
+                         **metrics)
 
 @bp.route('/users')
 @login_required
 @admin_required
 def users():
-    page = request.args.get('page', 1, type=int)
-    users = User.query.paginate(
-        page=page, per_page=20, error_out=False)
-    return render_template('admin/users.html', users=users)
+    # Keyset pagination on id; older OFFSET pages got slower the deeper they went
+    page = id_keyset_page(User.query, User.id, None, current_app.config['HISTORY_PAGE_SIZE'])
+    return render_template('admin/users.html', page=page, total_users=platform_metrics()['total_users'])
+
+@bp.route('/users/rows')
+@login_required
+@admin_required
+def user_rows():
+    """Next page of the user list as an HTML fragment for "Load more"."""
+    page = id_keyset_page(User.query, User.id, request.args.get('cursor'), current_app.config['HISTORY_PAGE_SIZE'])
+    html = render_template('admin/_user_rows.html', users=page.items)
+    next_url = url_for('admin.user_rows', cursor=page.next_cursor) if page.has_more else None
+    return fragment_response(html, next_url)
 
 @bp.route('/create_user', methods=['GET', 'POST'])
 @login_required
@@ -51,6 +61,7 @@ def create_user():
         user.set_password(form.password.data)
         db.session.add(user)
         db.session.commit()
+        metrics_cache().clear()
         flash(f'User {user.username} has been created successfully!', 'success')
         return redirect(url_for('admin.users'))
     return render_template('admin/create_user.html', form=form)
@@ -67,6 +78,8 @@ def edit_user(id):
         user.email = form.email.data
         user.is_admin = form.is_admin.data
         db.session.commit()
+        metrics_cache().clear()
+        invalidate_identity(user.id)
         flash(f'User {user.username} has been updated successfully!', 'success')
         return redirect(url_for('admin.users'))
     elif request.method == 'GET':
@@ -95,8 +108,18 @@ def delete_user(id):
             return redirect(url_for('admin.users'))
     
     username = user.username
+    # Derived per-user tables have no relationship on User, so their rows are
+    # removed here; a new account that reuses the id must not inherit them
+    DailyNutrition.query.filter_by(user_id=user.id).delete()
+    FastingState.query.filter_by(user_id=user.id).delete()
+    FoodCatalog.query.filter_by(user_id=user.id).delete()
+    WeightForecast.query.filter_by(user_id=user.id).delete()
     db.session.delete(user)
     db.session.commit()
+    metrics_cache().clear()
+    invalidate_identity(id)
+    # A new account given the same id starts its weight version from zero again
+    trend_cache().pop(id)
     flash(f'User {username} has been deleted successfully!', 'success')
     return redirect(url_for('admin.users'))
 
@@ -110,6 +133,7 @@ def change_user_password(id):
     if form.validate_on_submit():
         user.set_password(form.password.data)
         db.session.commit()
+        invalidate_identity(user.id)
         flash(f'Password for {user.username} has been changed successfully!', 'success')
         return redirect(url_for('admin.users'))
     
@@ -122,9 +146,11 @@ def change_admin_password():
     form = AdminPasswordChangeForm()
     
     if form.validate_on_submit():
-        if current_user.check_password(form.current_password.data):
-            current_user.set_password(form.new_password.data)
+        user = db.session.get(User, current_user.id)
+        if user.check_password(form.current_password.data):
+            user.set_password(form.new_password.data)
             db.session.commit()
+            invalidate_identity(user.id)
             flash('Your password has been changed successfully!', 'success')
             return redirect(url_for('admin.dashboard'))
         else:
@@ -156,4 +182,6 @@ def toggle_admin(id):
         flash(f'Admin privileges granted to {user.username}!', 'success')
     
     db.session.commit()
+    metrics_cache().clear()
+    invalidate_identity(user.id)
     return redirect(url_for('admin.users'))
\ No newline at end of file
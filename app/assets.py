@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import click
+from flask import current_app, request, send_from_directory
+from flask.cli import with_appcontext
+from werkzeug.exceptions import NotFound
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip variants are built
+    brotli = None
+
+# Served with one of these types, a file is worth storing precompressed
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml', 'image/x-icon',
+                      'image/vnd.microsoft.icon')
+# A variant is only kept when it saves at least this fraction of the original size
+MIN_COMPRESSION_SAVING = 0.1
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+def _fingerprinted_name(filename, content):
+    root, ext = os.path.splitext(filename)
+    return f'{root}.{hashlib.sha256(content).hexdigest()[:12]}{ext}'
+
+def _is_compressible(filename):
+    mimetype = mimetypes.guess_type(filename)[0] or ''
+    return mimetype.startswith(COMPRESSIBLE_TYPES)
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as output:
+        output.write(content)
+
+def build_assets(static_folder, build_dir):
+    """Copy every static file into build_dir under a content-hashed name, with .gz/.br variants.
+
+    Returns the manifest mapping each original path to its fingerprinted one,
+    which is also written to build_dir/manifest.json.
+    """
+    if os.path.isdir(build_dir):
+        shutil.rmtree(build_dir)
+    manifest = {}
+    for directory, _, files in os.walk(static_folder):
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            filename = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            with open(path, 'rb') as source:
+                content = source.read()
+            fingerprinted = _fingerprinted_name(filename, content)
+            target = os.path.join(build_dir, fingerprinted)
+            _write(target, content)
+            manifest[filename] = fingerprinted
+
+            if not _is_compressible(filename):
+                continue
+            variants = [('.gz', gzip.compress(content, 9, mtime=0))]
+            if brotli is not None:
+                variants.append(('.br', brotli.compress(content, quality=11)))
+            for suffix, compressed in variants:
+                if len(compressed) <= len(content) * (1 - MIN_COMPRESSION_SAVING):
+                    _write(target + suffix, compressed)
+
+    _write(os.path.join(build_dir, 'manifest.json'), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+class StaticAssets:
+    """Fingerprinted static files with far-future caching and precompressed variants.
+
+    `flask assets build` writes a content-hashed copy of every file under
+    app/static to STATIC_BUILD_DIR, plus gzip (and, with the brotli package,
+    brotli) variants and a manifest. When the manifest exists,
+    url_for('static', ...) emits the hashed names, and those are served with
+    an immutable Cache-Control header and the best encoding the client
+    accepts. A changed file gets a new name, so browsers never revalidate.
+    Without a build, or in debug mode, static files are served as usual.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['static_assets'] = self
+        self.build_dir = app.config.get('STATIC_BUILD_DIR')
+        self.manifest = {}
+        self.originals = {}
+        manifest_path = os.path.join(self.build_dir, 'manifest.json') if self.build_dir else None
+        if app.debug or not manifest_path or not os.path.isfile(manifest_path):
+            return
+
+        with open(manifest_path) as manifest:
+            self.manifest = json.load(manifest)
+        self.originals = {fingerprinted: filename for filename, fingerprinted in self.manifest.items()}
+        self.encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+        app.url_defaults(self._fingerprint_url)
+        app.view_functions['static'] = self.send_static_file
+
+    def _fingerprint_url(self, endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = self.manifest.get(values['filename'], values['filename'])
+
+    def send_static_file(self, filename):
+        original = self.originals.get(filename)
+        if original is None:
+            return current_app.send_static_file(filename)
+
+        mimetype = mimetypes.guess_type(original)[0] or 'application/octet-stream'
+        path = filename
+        encoding = None
+        if _is_compressible(original):
+            for candidate in self.encodings:
+                suffix = '.br' if candidate == 'br' else '.gz'
+                if request.accept_encodings[candidate] and os.path.isfile(os.path.join(self.build_dir, filename + suffix)):
+                    path, encoding = filename + suffix, candidate
+                    break
+
+        try:
+            response = send_from_directory(self.build_dir, path, mimetype=mimetype, max_age=31536000)
+        except NotFound:
+            # The build directory no longer matches the manifest, e.g. mid-deploy
+            return current_app.send_static_file(original)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if _is_compressible(original):
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+@click.group('assets')
+def assets_cli():
+    """Static asset tools."""
+
+@assets_cli.command('build')
+@with_appcontext
+def build_command():
+    """Fingerprint and precompress app/static into STATIC_BUILD_DIR, e.g. at deploy time."""
+    build_dir = current_app.config.get('STATIC_BUILD_DIR')
+    if not build_dir:
+        raise click.ClickException('STATIC_BUILD_DIR is not set.')
+    manifest = build_assets(current_app.static_folder, build_dir)
+    variants = sum(name.endswith(('.gz', '.br')) for _, _, files in os.walk(build_dir) for name in files)
+    click.echo(f'Fingerprinted {len(manifest)} files with {variants} compressed variants into {build_dir}.')
+    if brotli is None:
+        click.echo('Install the brotli package to also build .br variants.')
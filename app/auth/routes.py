@@ -5,6 +5,7 @@ from app import db
 from app.auth import bp
 from app.auth.forms import LoginForm, RegistrationForm
 from app.models import User
+from app.hashing import PasswordHashingBusy
 from datetime import datetime
 
 @bp.route('/login', methods=['GET', 'POST'])
@@ -15,10 +16,22 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(username=form.username.data).first()
-        if user is None or not user.check_password(form.password.data):
+        try:
+            valid = user is not None and user.check_password(form.password.data)
+        except PasswordHashingBusy:
+            flash('Too many sign-ins right now. Please try again in a moment.', 'error')
+            return render_template('auth/login.html', title='Sign In', form=form), 503
+        if not valid:
             flash('Invalid username or password', 'error')
             return redirect(url_for('auth.login'))
-        
+
+        # Upgrade hashes made with older parameters while the password is at hand
+        if user.password_needs_rehash():
+            try:
+                user.set_password(form.password.data)
+            except PasswordHashingBusy:
+                pass  # Try again on the next login
+
         # Update last login time
         user.last_login = datetime.utcnow()
         db.session.commit()
@@ -39,7 +52,11 @@ def register():
     form = RegistrationForm()
     if form.validate_on_submit():
         user = User(username=form.username.data, email=form.email.data)
-        user.set_password(form.password.data)
+        try:
+            user.set_password(form.password.data)
+        except PasswordHashingBusy:
+            flash('Too many sign-ups right now. Please try again in a moment.', 'error')
+            return render_template('auth/register.html', title='Register', form=form), 503
         db.session.add(user)
         db.session.commit()
         flash('Congratulations, you are now a registered user!', 'success')
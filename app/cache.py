@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, _MISSING)
+            return default if item is _MISSING else item[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+def app_cache(name, size_key, ttl_key, factory=TTLCache):
+    """Return the current app's cache stored as extensions[name], creating it on first use.
+
+    It is built as factory(maxsize=..., ttl=...) from the size_key and ttl_key
+    config values; a size_key of None makes a single-entry cache.
+    """
+    cache = current_app.extensions.get(name)
+    if cache is None:
+        maxsize = current_app.config[size_key] if size_key else 1
+        # setdefault keeps the first cache if two threads get here at once
+        cache = current_app.extensions.setdefault(name, factory(maxsize=maxsize,
+                                                                ttl=current_app.config[ttl_key]))
+    return cache
@@ -2,4 +2,4 @@ from flask import Blueprint
 
 bp = Blueprint('calories', __name__)
 
-from app.calories import routes 
\ No newline at end of file
+from app.calories import routes, commands 
\ No newline at end of file
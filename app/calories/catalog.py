@@ -0,0 +1,143 @@
+from sqlalchemy import bindparam, case, delete, insert, update
+from app.extensions import db
+from app.models import CalorieEntry, FoodCatalog
+
+CATALOG_VALUES = ('food_name', 'calories', 'meal_type', 'protein', 'carbs', 'fat', 'fiber')
+
+def normalize_food_name(name):
+    """Catalog key for a food name: trimmed, single-spaced and lowercased."""
+    return ' '.join((name or '').split()).lower()
+
+def record_foods(user_id, entries):
+    """Upsert foods into the user's catalog in the current transaction.
+
+    `entries` yields (values, used_at, uses) tuples, where `values` holds
+    CATALOG_VALUES taken from an entry. Repeats of a food are merged and the
+    most recent entry's values win, so autocomplete suggests what the user
+    logged last. Existing rows are updated with one executemany UPDATE and new
+    ones added with one executemany INSERT.
+    """
+    foods = {}
+    for values, used_at, uses in entries:
+        key = normalize_food_name(values['food_name'])
+        if not key:
+            continue
+        food = foods.get(key)
+        if food is None or used_at >= food['last_used_at']:
+            row = {name: values.get(name) or 0 for name in CATALOG_VALUES}
+            row['food_name'] = ' '.join(values['food_name'].split())
+            row['meal_type'] = values.get('meal_type') or 'snack'
+            food = dict(row, user_id=user_id, name_key=key, last_used_at=used_at,
+                        use_count=food['use_count'] if food else 0)
+            foods[key] = food
+        food['use_count'] += uses
+    if not foods:
+        return
+
+    existing = set(db.session.scalars(
+        db.select(FoodCatalog.name_key)
+        .where(FoodCatalog.user_id == user_id, FoodCatalog.name_key.in_(list(foods)))
+    ))
+    catalog = FoodCatalog.__table__
+    # Stored values are only replaced by ones from an entry at least as recent
+    newer = catalog.c.last_used_at <= bindparam('b_last_used_at')
+    updates = [{'b_' + name: value for name, value in food.items()}
+               for key, food in foods.items() if key in existing]
+    if updates:
+        db.session.execute(
+            update(catalog)
+            .where(catalog.c.user_id == bindparam('b_user_id'), catalog.c.name_key == bindparam('b_name_key'))
+            .values(use_count=catalog.c.use_count + bindparam('b_use_count'),
+                    **{name: case((newer, bindparam('b_' + name)), else_=catalog.c[name])
+                       for name in CATALOG_VALUES + ('last_used_at',)}),
+            updates
+        )
+    inserts = [dict(food, use_count=max(food['use_count'], 1))
+               for key, food in foods.items() if key not in existing]
+    if inserts:
+        db.session.execute(insert(catalog), inserts)
+
+def record_entry(entry, uses=1):
+    """Add a CalorieEntry to its user's catalog (uses=0 when an entry is only edited)."""
+    record_foods(entry.user_id, [({name: getattr(entry, name) for name in CATALOG_VALUES}, entry.date, uses)])
+
+def remove_entry(entry, food_name=None):
+    """Take one use of a CalorieEntry out of its user's catalog (under `food_name` if it was renamed).
+
+    A food left with no uses is dropped, like an empty day in the rollup. If
+    the entry was the food's latest use, the stored values fall back to the
+    latest remaining entry, so the row matches what rebuild_catalog builds.
+    """
+    key = normalize_food_name(food_name if food_name is not None else entry.food_name)
+    if not key:
+        return
+    food = db.session.get(FoodCatalog, (entry.user_id, key))
+    if food is None:
+        return
+    if food.use_count <= 1:
+        db.session.delete(food)
+        return
+    food.use_count -= 1
+    if entry.date < food.last_used_at:
+        return
+
+    # Names are normalized in Python, so narrow by a LIKE on the first word and compare exactly here
+    candidates = CalorieEntry.query.filter(
+        CalorieEntry.user_id == entry.user_id,
+        CalorieEntry.id != entry.id,
+        db.func.lower(CalorieEntry.food_name).contains(key.split()[0], autoescape=True)
+    ).order_by(CalorieEntry.date.desc(), CalorieEntry.id.desc())
+    latest = next((candidate for candidate in candidates if normalize_food_name(candidate.food_name) == key), None)
+    if latest is None:
+        db.session.delete(food)
+        return
+    for name in CATALOG_VALUES:
+        setattr(food, name, getattr(latest, name) or 0)
+    food.food_name = ' '.join(latest.food_name.split())
+    food.last_used_at = latest.date
+
+def search_foods(user_id, query, limit=10):
+    """Catalog foods whose name starts with `query`, most used first.
+
+    The prefix becomes a range on the (user_id, name_key) primary key, so
+    only matching rows are read however large the catalog is.
+    """
+    prefix = normalize_food_name(query)
+    if not prefix:
+        return []
+    return FoodCatalog.query.filter(
+        FoodCatalog.user_id == user_id,
+        FoodCatalog.name_key >= prefix,
+        FoodCatalog.name_key < prefix + '\U0010ffff'
+    ).order_by(FoodCatalog.use_count.desc(), FoodCatalog.last_used_at.desc()).limit(limit).all()
+
+def rebuild_catalog(user_id=None):
+    """Recreate the catalog from the raw CalorieEntry rows."""
+    clear = delete(FoodCatalog)
+    query = db.select(CalorieEntry.user_id, CalorieEntry.date, *[getattr(CalorieEntry, name) for name in CATALOG_VALUES])\
+        .order_by(CalorieEntry.user_id, CalorieEntry.date, CalorieEntry.id)
+    if user_id is not None:
+        clear = clear.where(FoodCatalog.user_id == user_id)
+        query = query.where(CalorieEntry.user_id == user_id)
+    db.session.execute(clear)
+
+    foods = {}
+    current_user_id = None
+    for row in db.session.execute(query.execution_options(yield_per=1000)):
+        if row.user_id != current_user_id:
+            _insert_catalog(foods)
+            foods = {}
+            current_user_id = row.user_id
+        key = normalize_food_name(row.food_name)
+        if not key:
+            continue
+        food = foods.setdefault(key, {'user_id': row.user_id, 'name_key': key, 'use_count': 0})
+        food.update({name: getattr(row, name) or 0 for name in CATALOG_VALUES})
+        food['food_name'] = ' '.join(row.food_name.split())
+        food['use_count'] += 1
+        food['last_used_at'] = row.date
+    _insert_catalog(foods)
+
+def _insert_catalog(foods):
+    if foods:
+        db.session.execute(db.insert(FoodCatalog), list(foods.values()))
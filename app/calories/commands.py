@@ -0,0 +1,31 @@
+import click
+from app.extensions import db
+from app.calories import bp
+from app.calories.rollup import rebuild_rollup, check_rollup
+from app.calories.catalog import rebuild_catalog
+
+@bp.cli.command('rebuild-rollup')
+@click.option('--user-id', type=int, help='Only rebuild the rollup for this user.')
+@click.option('--check', is_flag=True, help='Compare the rollup with the raw entries without changing it.')
+def rebuild_rollup_command(user_id, check):
+    """Backfill or verify the daily_nutrition rollup."""
+    if check:
+        mismatches = check_rollup(user_id)
+        for (mismatch_user, day), expected, actual in mismatches:
+            click.echo(f'user {mismatch_user} {day}: entries={expected} rollup={actual}')
+        if mismatches:
+            raise click.ClickException(f'{len(mismatches)} day(s) differ from the raw entries.')
+        click.echo('Rollup matches the raw entries.')
+        return
+
+    rebuild_rollup(user_id)
+    db.session.commit()
+    click.echo('Rollup rebuilt.')
+
+@bp.cli.command('rebuild-catalog')
+@click.option('--user-id', type=int, help='Only rebuild the catalog for this user.')
+def rebuild_catalog_command(user_id):
+    """Rebuild the food_catalog used for autocomplete from the raw entries."""
+    rebuild_catalog(user_id)
+    db.session.commit()
+    click.echo('Food catalog rebuilt.')
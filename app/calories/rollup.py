@@ -0,0 +1,101 @@
+from datetime import datetime, time, timedelta
+from sqlalchemy import func, insert, delete, update
+from app.extensions import db
+from app.models import CalorieEntry, DailyNutrition
+
+NUTRIENTS = ('calories', 'protein', 'carbs', 'fat', 'fiber')
+
+def adjust_rollup(user_id, day, entries=0, **deltas):
+    """Add the given deltas to a user's daily_nutrition row in the current transaction.
+
+    The row is updated with a single UPDATE so concurrent writers add to it
+    instead of overwriting each other, and is created on first use.
+    """
+    values = {name: getattr(DailyNutrition, name) + deltas.get(name, 0) for name in NUTRIENTS}
+    values['entry_count'] = DailyNutrition.entry_count + entries
+    result = db.session.execute(
+        update(DailyNutrition)
+        .where(DailyNutrition.user_id == user_id, DailyNutrition.day == day)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.session.add(DailyNutrition(
+            user_id=user_id,
+            day=day,
+            entry_count=entries,
+            **{name: deltas.get(name, 0) for name in NUTRIENTS}
+        ))
+
+def add_entry_to_rollup(entry, sign=1):
+    """Count a CalorieEntry into (or with sign=-1, out of) its day's totals."""
+    adjust_rollup(
+        entry.user_id,
+        entry.date.date(),
+        entries=sign,
+        **{name: sign * (getattr(entry, name) or 0) for name in NUTRIENTS}
+    )
+
+def remove_entry_from_rollup(entry):
+    add_entry_to_rollup(entry, sign=-1)
+    # A day with no entries left has no row, as after rebuild_rollup
+    db.session.execute(
+        delete(DailyNutrition)
+        .where(DailyNutrition.user_id == entry.user_id, DailyNutrition.day == entry.date.date(),
+               DailyNutrition.entry_count <= 0)
+        .execution_options(synchronize_session=False)
+    )
+
+def _raw_daily_totals(user_id=None, first_day=None, last_day=None):
+    """Select statement aggregating CalorieEntry rows the same way the rollup stores them."""
+    day = func.date(CalorieEntry.date)
+    query = db.select(
+        CalorieEntry.user_id,
+        day,
+        *[func.coalesce(func.sum(getattr(CalorieEntry, name)), 0) for name in NUTRIENTS],
+        func.count(CalorieEntry.id)
+    ).group_by(CalorieEntry.user_id, day)
+    if user_id is not None:
+        query = query.where(CalorieEntry.user_id == user_id)
+    if first_day is not None:
+        query = query.where(CalorieEntry.date >= datetime.combine(first_day, time.min))
+    if last_day is not None:
+        query = query.where(CalorieEntry.date < datetime.combine(last_day + timedelta(days=1), time.min))
+    return query
+
+def rebuild_rollup(user_id=None, first_day=None, last_day=None):
+    """Recompute daily_nutrition from the raw CalorieEntry rows, optionally for a range of days only."""
+    clear = delete(DailyNutrition)
+    if user_id is not None:
+        clear = clear.where(DailyNutrition.user_id == user_id)
+    if first_day is not None:
+        clear = clear.where(DailyNutrition.day >= first_day)
+    if last_day is not None:
+        clear = clear.where(DailyNutrition.day <= last_day)
+    db.session.execute(clear)
+    db.session.execute(insert(DailyNutrition).from_select(
+        ['user_id', 'day', *NUTRIENTS, 'entry_count'],
+        _raw_daily_totals(user_id, first_day, last_day)
+    ))
+
+def check_rollup(user_id=None, tolerance=1e-6):
+    """Compare daily_nutrition with the raw rows and return the mismatching (user_id, day) keys."""
+    raw = {}
+    for row in db.session.execute(_raw_daily_totals(user_id)):
+        raw[(row[0], str(row[1]))] = tuple(row[2:])
+
+    query = db.select(DailyNutrition)
+    if user_id is not None:
+        query = query.where(DailyNutrition.user_id == user_id)
+    stored = {}
+    for rollup in db.session.scalars(query):
+        stored[(rollup.user_id, str(rollup.day))] = tuple(getattr(rollup, name) for name in NUTRIENTS) + (rollup.entry_count,)
+
+    # Days whose entries were all deleted keep a row of zeros
+    empty = (0,) * (len(NUTRIENTS) + 1)
+    mismatches = []
+    for key in sorted(set(raw) | set(stored)):
+        expected, actual = raw.get(key, empty), stored.get(key, empty)
+        if any(abs(a - b) > tolerance for a, b in zip(expected, actual)):
+            mismatches.append((key, expected, actual))
+    return mismatches
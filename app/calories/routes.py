@@ -1,19 +1,22 @@
-from flask import render_template, flash, redirect, url_for, request
+from flask import render_template, flash, redirect, url_for, request, jsonify, current_app
 from flask_login import login_required, current_user
 from app import db
 from app.calories import bp
 from app.calories.forms import FoodEntryForm, TDEECalculatorForm
-from app.models import CalorieEntry
+from app.models import CalorieEntry, DailyNutrition, bump_data_version
+from app.calories.rollup import add_entry_to_rollup, remove_entry_from_rollup, adjust_rollup
+from app.calories.catalog import normalize_food_name, record_entry, remove_entry, search_foods
+from app.replica import replica_reads
 from datetime import datetime, timedelta
 from sqlalchemy import func
 
-def calculate_daily_nutrients(entries):
-    """Calculate daily nutritional breakdown from entries."""
+def calculate_daily_nutrients(totals):
+    """Calculate daily nutritional breakdown from a day's rollup row."""
     daily_nutrients = {
-        'protein': sum(entry.protein for entry in entries if entry.protein),
-        'carbs': sum(entry.carbs for entry in entries if entry.carbs),
-        'fat': sum(entry.fat for entry in entries if entry.fat),
-        'fiber': sum(entry.fiber for entry in entries if entry.fiber)
+        'protein': totals.protein if totals else 0,
+        'carbs': totals.carbs if totals else 0,
+        'fat': totals.fat if totals else 0,
+        'fiber': totals.fiber if totals else 0
     }
     
     # Calculate percentages
@@ -41,22 +44,18 @@ def calculate_target_nutrients(daily_calories):
 
 def calculate_weekly_stats(user_id):
     """Calculate weekly statistics for calorie tracking."""
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    entries = CalorieEntry.query.filter(
-        CalorieEntry.user_id == user_id,
-        CalorieEntry.date >= week_ago
-    ).all()
+    week_ago = (datetime.utcnow() - timedelta(days=7)).date()
+    daily_totals = [row.calories for row in DailyNutrition.query.filter(
+        DailyNutrition.user_id == user_id,
+        DailyNutrition.day >= week_ago,
+        DailyNutrition.entry_count > 0
+    ).all()]
     
-    if not entries:
+    if not daily_totals:
         return None
-        
-    daily_totals = {}
-    for entry in entries:
-        date = entry.date.date()
-        daily_totals[date] = daily_totals.get(date, 0) + entry.calories
     
-    avg_calories = sum(daily_totals.values()) / len(daily_totals) if daily_totals else 0
-    goal_adherence = len([cal for cal in daily_totals.values() if 1800 <= cal <= 2200]) / len(daily_totals) * 100 if daily_totals else 0
+    avg_calories = sum(daily_totals) / len(daily_totals)
+    goal_adherence = len([cal for cal in daily_totals if 1800 <= cal <= 2200]) / len(daily_totals) * 100
     
     return {
         'avg_calories': avg_calories,
@@ -82,6 +81,7 @@ def calculate_meal_distribution(entries):
     
     return distribution
 
+@replica_reads()
 def get_frequent_foods(user_id):
     """Get most frequently logged foods in the past week."""
     week_ago = datetime.utcnow() - timedelta(days=7)
@@ -120,9 +120,13 @@ def calculator():
             carbs=form.carbs.data or 0,
             fat=form.fat.data or 0,
             fiber=form.fiber.data or 0,
-            user=current_user
+            date=datetime.utcnow(),
+            user_id=current_user.id
         )
         db.session.add(entry)
+        add_entry_to_rollup(entry)
+        record_entry(entry)
+        bump_data_version(current_user.id)
         db.session.commit()
         flash('Food entry added successfully!', 'success')
         return redirect(url_for('calories.calculator'))
@@ -134,13 +138,14 @@ def calculator():
         CalorieEntry.date >= today_start
     ).order_by(CalorieEntry.date.desc()).all()
 
-    # Calculate daily totals
-    calories_consumed = sum(entry.calories for entry in food_entries)
+    # Daily totals come from the rollup instead of summing the entries
+    today_totals = db.session.get(DailyNutrition, (current_user.id, today_start.date()))
+    calories_consumed = today_totals.calories if today_totals else 0
     daily_goal = 2500  # This should be customizable per user
     calories_remaining = daily_goal - calories_consumed
 
     # Calculate nutritional breakdown
-    daily_nutrients = calculate_daily_nutrients(food_entries)
+    daily_nutrients = calculate_daily_nutrients(today_totals)
     target_nutrients = calculate_target_nutrients(daily_goal)
 
     # Calculate weekly statistics
@@ -164,6 +169,24 @@ def calculator():
                          meal_distribution=meal_distribution,
                          frequent_foods=frequent_foods)
 
+@bp.route('/search')
+@login_required
+def search():
+    """Autocomplete: the user's catalog foods starting with ?q=, with their last-used values."""
+    foods = search_foods(current_user.id, request.args.get('q', ''),
+                         limit=current_app.config['FOOD_SEARCH_LIMIT'])
+    response = jsonify([{
+        'food_name': food.food_name,
+        'calories': food.calories,
+        'meal_type': food.meal_type,
+        'protein': food.protein,
+        'carbs': food.carbs,
+        'fat': food.fat,
+        'fiber': food.fiber
+    } for food in foods])
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @bp.route('/edit/<int:entry_id>', methods=['POST'])
 @login_required
 def edit_entry(entry_id):
@@ -180,9 +203,16 @@ def edit_entry(entry_id):
         if not food_name or calories < 0 or calories > 5000:
             raise ValueError("Invalid input values")
         
+        adjust_rollup(entry.user_id, entry.date.date(), calories=calories - entry.calories)
+        renamed = normalize_food_name(food_name) != normalize_food_name(entry.food_name)
+        if renamed:
+            # The use moves from the old name to the new one
+            remove_entry(entry)
         entry.food_name = food_name
         entry.calories = calories
         entry.meal_type = meal_type
+        record_entry(entry, uses=1 if renamed else 0)
+        bump_data_version(current_user.id)
         db.session.commit()
         flash('Food entry updated successfully!', 'success')
     except (ValueError, TypeError) as e:
@@ -198,7 +228,10 @@ def delete_entry(entry_id):
         flash('You cannot delete this entry.', 'error')
         return redirect(url_for('calories.calculator'))
     
+    remove_entry_from_rollup(entry)
+    remove_entry(entry)
     db.session.delete(entry)
+    bump_data_version(current_user.id)
     db.session.commit()
     flash('Food entry deleted successfully!', 'success')
     return redirect(url_for('calories.calculator'))
@@ -0,0 +1,103 @@
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip is offered
+    brotli = None
+
+# Never compressed: server-sent events must reach the browser event by event
+UNCOMPRESSED_MIMETYPES = ('text/event-stream',)
+
+def gzip_compressor(level):
+    return zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+
+class _BrotliCompressor:
+    """Gives brotli's streaming compressor the zlib compressobj interface."""
+
+    def __init__(self, quality):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self, mode=zlib.Z_FINISH):
+        return self.compressor.finish() if mode == zlib.Z_FINISH else self.compressor.flush()
+
+def _compressed_chunks(chunks, compressor):
+    # Each chunk is flushed as it is produced so a streamed page or export
+    # keeps arriving progressively instead of waiting for the whole body
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                if data:
+                    yield data
+        yield compressor.flush()
+    finally:
+        # Closing the wrapped iterator lets stream_with_context tear down its context
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+class ResponseCompression:
+    """gzip/brotli compression of HTML, JSON and CSV responses.
+
+    Only content types listed in COMPRESSION_MIMETYPES are compressed, each
+    once its body reaches that type's minimum size, with the best encoding
+    the client accepts. Streamed (generator) responses are compressed chunk
+    by chunk whatever their size. Responses that already have a
+    Content-Encoding, files sent with send_file, event streams and anything
+    marked no-transform pass through untouched. Nothing is registered unless
+    COMPRESSION_ENABLED is set.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('COMPRESSION_ENABLED'):
+            return
+        self.mimetypes = app.config['COMPRESSION_MIMETYPES']
+        self.level = app.config['COMPRESSION_LEVEL']
+        self.brotli_quality = app.config['COMPRESSION_BROTLI_QUALITY']
+        self.encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+        app.after_request(self._compress)
+
+    def compressor(self, encoding):
+        return _BrotliCompressor(self.brotli_quality) if encoding == 'br' else gzip_compressor(self.level)
+
+    def _compress(self, response):
+        min_size = self.mimetypes.get(response.mimetype)
+        if (min_size is None or response.mimetype in UNCOMPRESSED_MIMETYPES
+                or response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough or 'Content-Encoding' in response.headers
+                or response.cache_control.no_transform):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(self.encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compressed_chunks(response.response, self.compressor(encoding))
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            compressor = self.compressor(encoding)
+            compressed = compressor.compress(data) + compressor.flush()
+            if len(compressed) >= len(data):
+                return response
+            response.set_data(compressed)
+
+        response.headers['Content-Encoding'] = encoding
+        # The encoded body is a different byte sequence, so a strong ETag no longer holds
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,5 @@
+from flask import Blueprint
+
+bp = Blueprint('data', __name__)
+
+from app.data import routes, commands
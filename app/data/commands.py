@@ -0,0 +1,24 @@
+import click
+from app.data import bp
+from app.data.importer import import_csv, ImportFileError, IMPORT_COLUMNS
+from app.models import User
+
+@bp.cli.command('import-csv')
+@click.argument('kind', type=click.Choice(list(IMPORT_COLUMNS)))
+@click.argument('csv_file', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--user', 'username', required=True, help='Username that will own the imported rows.')
+@click.option('--batch-size', type=int, help='Rows per INSERT/commit chunk (default: IMPORT_BATCH_SIZE).')
+def import_csv_command(kind, csv_file, username, batch_size):
+    """Import weight, calorie or fasting history from a CSV file."""
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f'No user named "{username}".')
+    try:
+        result = import_csv(csv_file, kind, user.id, batch_size=batch_size)
+    except ImportFileError as e:
+        raise click.ClickException(str(e))
+    for line, message in result.errors:
+        click.echo(f'line {line}: {message}', err=True)
+    if result.error_count > len(result.errors):
+        click.echo(f'... and {result.error_count - len(result.errors)} more invalid rows', err=True)
+    click.echo(f'Imported {result.imported} {kind} rows, skipped {result.error_count}.')
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from flask import current_app
+from app.extensions import db
+from app.models import WeightEntry, CalorieEntry, FastingSession, WeightGoal
+
+# Columns written for each kind; the first ones match IMPORT_COLUMNS so exports can be re-imported
+EXPORTS = {
+    'weight': (WeightEntry, WeightEntry.date, ('date', 'weight')),
+    'calories': (CalorieEntry, CalorieEntry.date,
+                 ('date', 'food_name', 'calories', 'meal_type', 'protein', 'carbs', 'fat', 'fiber')),
+    'fasting': (FastingSession, FastingSession.start_time,
+                ('start_time', 'end_time', 'target_hours', 'completed', 'duration_hours')),
+    'goals': (WeightGoal, WeightGoal.start_date,
+              ('start_date', 'target_date', 'start_weight', 'target_weight', 'goal_type', 'active', 'completed'))
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+def _export_rows(kind, user_id):
+    """Yield the user's rows as tuples, fetched from a server-side cursor in yield_per batches.
+
+    Plain columns are selected instead of ORM objects so nothing accumulates
+    in the session's identity map while the export runs.
+    """
+    model, order_column, columns = EXPORTS[kind]
+    query = db.select(*[getattr(model, name) for name in columns])\
+        .where(model.user_id == user_id)\
+        .order_by(order_column, model.id)\
+        .execution_options(yield_per=current_app.config['EXPORT_BATCH_SIZE'])
+    for row in db.session.execute(query):
+        yield tuple(_format_value(value) for value in row)
+
+def _csv_lines(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row))) + '\n'
+
+def _chunked(lines, chunk_size):
+    """Join small lines into chunks of about chunk_size bytes before they hit the socket."""
+    parts = []
+    size = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        parts.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            yield b''.join(parts)
+            parts = []
+            size = 0
+    if parts:
+        yield b''.join(parts)
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_stream(kind, fmt, user_id, gzip=False):
+    """Return a generator of bytes with the user's `kind` history in `fmt`."""
+    columns = EXPORTS[kind][2]
+    rows = _export_rows(kind, user_id)
+    lines = _csv_lines(columns, rows) if fmt == 'csv' else _ndjson_lines(columns, rows)
+    chunks = _chunked(lines, current_app.config['EXPORT_CHUNK_SIZE'])
+    return _gzipped(chunks) if gzip else chunks
@@ -0,0 +1,15 @@
+from flask_wtf import FlaskForm
+from flask_wtf.file import FileField, FileRequired, FileAllowed
+from wtforms import SelectField, SubmitField
+
+class ImportForm(FlaskForm):
+    kind = SelectField('Data Type', choices=[
+        ('weight', 'Weight entries'),
+        ('calories', 'Food entries'),
+        ('fasting', 'Fasting sessions')
+    ])
+    file = FileField('CSV File', validators=[
+        FileRequired(),
+        FileAllowed(['csv'], 'Please upload a CSV file')
+    ])
+    submit = SubmitField('Import')
@@ -0,0 +1,175 @@
+import csv
+import io
+import math
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import insert
+from werkzeug.datastructures import MultiDict
+from app.extensions import db
+from app.models import WeightEntry, CalorieEntry, FastingSession, bump_data_version
+from app.weight.forms import WeightEntryForm
+from app.calories.forms import FoodEntryForm
+from app.calories.rollup import rebuild_rollup
+from app.calories.catalog import record_foods
+from app.fasting.streaks import recompute_fasting_state
+from app.weight.forecast import recompute_forecast
+
+DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M', '%Y-%m-%d')
+
+# Columns expected in the CSV header for each kind of import
+IMPORT_COLUMNS = {
+    'weight': ('date', 'weight'),
+    'calories': ('date', 'food_name', 'calories', 'meal_type', 'protein', 'carbs', 'fat', 'fiber'),
+    'fasting': ('start_time', 'end_time', 'target_hours')
+}
+
+class ImportFileError(ValueError):
+    """Raised when a whole file cannot be imported, e.g. because of a bad header."""
+
+class ImportResult:
+    def __init__(self, kind, max_errors):
+        self.kind = kind
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []  # First max_errors (line, messages) pairs only, so memory stays flat
+        self.max_errors = max_errors
+
+    def add_error(self, line, messages):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, messages))
+
+def parse_datetime(value):
+    value = (value or '').strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    raise ValueError(f'Invalid date "{value}", expected YYYY-MM-DD or YYYY-MM-DD HH:MM[:SS]')
+
+class _RowValidator:
+    """Validate CSV rows with a form class, reusing one form instance for speed."""
+
+    def __init__(self, form_class):
+        self.form = form_class(formdata=None, meta={'csrf': False})
+
+    def __call__(self, row):
+        # DictReader fills missing cells with None and collects extra ones under a None key
+        self.form.process(MultiDict([(key, value) for key, value in row.items() if key is not None and value is not None]))
+        if self.form.validate():
+            return self.form, []
+        return None, [f'{name}: {message}' for name, messages in self.form.errors.items() for message in messages]
+
+def _weight_row(validate, user_id, row):
+    date = parse_datetime(row.get('date'))
+    form, errors = validate(row)
+    if errors:
+        raise ValueError('; '.join(errors))
+    return {'user_id': user_id, 'date': date, 'weight': form.weight.data}
+
+def _calorie_row(validate, user_id, row):
+    date = parse_datetime(row.get('date'))
+    form, errors = validate(row)
+    if errors:
+        raise ValueError('; '.join(errors))
+    return {
+        'user_id': user_id,
+        'date': date,
+        'food_name': form.food_name.data.strip(),
+        'calories': form.calories.data,
+        'meal_type': form.meal_type.data,
+        'protein': form.protein.data or 0,
+        'carbs': form.carbs.data or 0,
+        'fat': form.fat.data or 0,
+        'fiber': form.fiber.data or 0
+    }
+
+def _fasting_row(validate, user_id, row):
+    start_time = parse_datetime(row.get('start_time'))
+    end_time = parse_datetime(row.get('end_time'))
+    if end_time <= start_time:
+        raise ValueError('end_time must be after start_time')
+    target_hours = (row.get('target_hours') or '').strip()
+    if target_hours:
+        try:
+            hours = float(target_hours)
+        except ValueError:
+            hours = math.nan
+        # Whole hours in the same range as FastingSessionForm.target_hours; inf and nan fail here too
+        if not math.isfinite(hours) or not hours.is_integer() or not 1 <= hours <= 504:
+            raise ValueError('target_hours: Please enter a valid duration between 1 and 504 hours (21 days)')
+        target_hours = int(hours)
+    return {
+        'user_id': user_id,
+        'start_time': start_time,
+        'end_time': end_time,
+        'target_hours': target_hours or None,
+        'completed': True,
+        'duration_hours': (end_time - start_time).total_seconds() / 3600
+    }
+
+IMPORTERS = {
+    'weight': (WeightEntry, WeightEntryForm, _weight_row),
+    'calories': (CalorieEntry, FoodEntryForm, _calorie_row),
+    'fasting': (FastingSession, None, _fasting_row)
+}
+
+def _flush_batch(kind, model, user_id, batch):
+    """Insert one chunk with executemany, update derived tables and commit."""
+    db.session.execute(insert(model), batch)
+    if kind == 'calories':
+        # Re-aggregate the chunk's days in one statement rather than one UPDATE per day
+        days = [row['date'].date() for row in batch]
+        rebuild_rollup(user_id, min(days), max(days))
+        record_foods(user_id, ((row, row['date'], 1) for row in batch))
+    bump_data_version(user_id, weights=kind == 'weight')
+    db.session.commit()
+
+def import_csv(stream, kind, user_id, batch_size=None, max_errors=None):
+    """Stream a CSV file of `kind` rows into the user's history.
+
+    Rows are validated one at a time and inserted in chunks of `batch_size`,
+    each in its own transaction, so memory use does not grow with the file.
+    Invalid rows are skipped and reported in the returned ImportResult.
+    """
+    if kind not in IMPORTERS:
+        raise ImportFileError(f'Unknown import type "{kind}"')
+    config = current_app.config
+    batch_size = batch_size or config['IMPORT_BATCH_SIZE']
+    result = ImportResult(kind, max_errors or config['IMPORT_MAX_REPORTED_ERRORS'])
+
+    if isinstance(stream, io.TextIOBase):
+        text = stream
+    else:
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    missing = [column for column in IMPORT_COLUMNS[kind][:2] if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ImportFileError(f'Missing column(s): {", ".join(missing)}. Expected: {", ".join(IMPORT_COLUMNS[kind])}')
+
+    model, form_class, build_row = IMPORTERS[kind]
+    validate = _RowValidator(form_class) if form_class else None
+    batch = []
+    for row in reader:
+        try:
+            batch.append(build_row(validate, user_id, row))
+        except (ValueError, TypeError) as e:
+            # Header is line 1
+            result.add_error(reader.line_num, str(e))
+            continue
+        if len(batch) >= batch_size:
+            _flush_batch(kind, model, user_id, batch)
+            result.imported += len(batch)
+            batch = []
+    if batch:
+        _flush_batch(kind, model, user_id, batch)
+        result.imported += len(batch)
+
+    if kind == 'fasting' and result.imported:
+        recompute_fasting_state(user_id)
+        db.session.commit()
+    elif kind == 'weight' and result.imported:
+        recompute_forecast(user_id)
+        db.session.commit()
+    return result
@@ -0,0 +1,45 @@
+from datetime import datetime
+from flask import render_template, flash, current_app, request, abort, Response, stream_with_context
+from flask_login import login_required, current_user
+from app.data import bp
+from app.data.forms import ImportForm
+from app.data.importer import import_csv, ImportFileError, IMPORT_COLUMNS
+from app.data.exporter import export_stream, EXPORTS, EXPORT_FORMATS
+
+@bp.route('/import', methods=['GET', 'POST'])
+@login_required
+def import_data():
+    form = ImportForm()
+    result = None
+    if form.validate_on_submit():
+        try:
+            result = import_csv(form.file.data.stream, form.kind.data, current_user.id)
+        except ImportFileError as e:
+            flash(str(e), 'error')
+        except UnicodeDecodeError:
+            flash('The file could not be read. Please upload a UTF-8 encoded CSV file.', 'error')
+        else:
+            if result.error_count:
+                flash(f'Imported {result.imported} rows, skipped {result.error_count} invalid rows.', 'error')
+            else:
+                flash(f'Imported {result.imported} rows.', 'success')
+            current_app.logger.info('User %s imported %s %s rows (%s skipped)',
+                                    current_user.id, result.imported, result.kind, result.error_count)
+    return render_template('data/import.html', form=form, result=result, columns=IMPORT_COLUMNS,
+                           export_kinds=list(EXPORTS), export_formats=list(EXPORT_FORMATS))
+
+@bp.route('/export/<kind>.<fmt>')
+@login_required
+def export_data(kind, fmt):
+    if kind not in EXPORTS or fmt not in EXPORT_FORMATS:
+        abort(404)
+    use_gzip = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+    filename = f'{kind}-{datetime.utcnow():%Y%m%d}.{fmt}' + ('.gz' if use_gzip else '')
+    # stream_with_context keeps the app context (and DB session) alive while the body streams
+    response = Response(
+        stream_with_context(export_stream(kind, fmt, current_user.id, gzip=use_gzip)),
+        mimetype='application/gzip' if use_gzip else EXPORT_FORMATS[fmt]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['Cache-Control'] = 'private, no-store'
+    return response
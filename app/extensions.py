@@ -1,9 +1,20 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_login import LoginManager
+from app.instrumentation import SQLInstrumentation
+from app.sqlite_tuning import SQLitePragmas
+from app.replica import RoutingSession
+from app.hashing import PasswordHasher
+from app.templating import TemplateBytecodeCache
+from app.assets import StaticAssets
+from app.compression import ResponseCompression
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login = LoginManager()
 login.login_view = 'auth.login'
-login.login_message = 'Please log in to access this page.' 
\ No newline at end of file
+login.login_message = 'Please log in to access this page.'
+instrumentation = SQLInstrumentation()
+sqlite_pragmas = SQLitePragmas()
+password_hasher = PasswordHasher()
+template_cache = TemplateBytecodeCache()
+static_assets = StaticAssets()
+compression = ResponseCompression()
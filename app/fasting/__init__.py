@@ -2,4 +2,4 @@ from flask import Blueprint
 
 bp = Blueprint('fasting', __name__)
 
-from app.fasting import routes 
\ No newline at end of file
+from app.fasting import routes, commands
\ No newline at end of file
@@ -0,0 +1,20 @@
+import click
+from app.extensions import db
+from app.fasting import bp
+from app.fasting.streaks import recompute_fasting_state
+from app.models import FastingSession
+
+@bp.cli.command('rebuild-streaks')
+@click.option('--user-id', type=int, help='Only rebuild the streaks of this user.')
+def rebuild_streaks_command(user_id):
+    """Recompute fasting streak state from the completed sessions."""
+    if user_id is not None:
+        user_ids = [user_id]
+    else:
+        user_ids = [row[0] for row in db.session.query(FastingSession.user_id)
+                    .filter(FastingSession.completed == True).distinct()]
+
+    for uid in user_ids:
+        recompute_fasting_state(uid)
+    db.session.commit()
+    click.echo(f'Rebuilt fasting streaks for {len(user_ids)} user(s).')
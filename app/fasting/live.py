@@ -0,0 +1,85 @@
+import threading
+from datetime import datetime
+from flask import current_app
+from app.cache import app_cache
+from app.models import FastingSession
+
+_lock = threading.Lock()
+_changes = {}  # user_id -> (sequence, event name)
+
+def active_fast_cache():
+    """Per-process LRU of each user's active fast, tagged with the change sequence it was read at.
+
+    The write routes bump the sequence, so this process stops serving the old
+    snapshot at once, including one read concurrently from before the commit.
+    Entries also expire after FASTING_STATUS_CACHE_TTL so changes made by
+    other worker processes are picked up within a bounded delay.
+    """
+    return app_cache('active_fast_cache', 'FASTING_STATUS_CACHE_SIZE', 'FASTING_STATUS_CACHE_TTL')
+
+def _snapshot(session):
+    if session is None:
+        return None
+    return {
+        'id': session.id,
+        'start_time': session.start_time,
+        'target_hours': session.target_hours
+    }
+
+def get_active_fast(user_id):
+    """Return a snapshot of the user's active fast, loading it when not cached."""
+    # Read the sequence before the row, so a change committed in between leaves
+    # this snapshot already stale rather than cached as current
+    sequence = last_change(user_id)[0]
+    cache = active_fast_cache()
+    cached = cache.get(user_id)
+    if cached is not None and cached[0] == sequence:
+        return cached[1]
+
+    session = FastingSession.query.filter_by(
+        user_id=user_id,
+        completed=False
+    ).order_by(FastingSession.start_time.desc()).first()
+    snapshot = _snapshot(session)
+    cache.set(user_id, (sequence, snapshot))
+    return snapshot
+
+def notify_fast_changed(user_id, event):
+    """Drop the cached active fast and record the change for open streams."""
+    with _lock:
+        sequence = _changes.get(user_id, (0, None))[0] + 1
+        _changes[user_id] = (sequence, event)
+    active_fast_cache().pop(user_id)
+
+def last_change(user_id):
+    with _lock:
+        return _changes.get(user_id, (0, None))
+
+def stream_slots():
+    """Semaphore bounding how many event streams this process keeps open at once."""
+    slots = current_app.extensions.get('fasting_stream_slots')
+    if slots is None:
+        slots = current_app.extensions['fasting_stream_slots'] = threading.BoundedSemaphore(
+            current_app.config['FASTING_STREAM_MAX_PER_PROCESS']
+        )
+    return slots
+
+def elapsed_hours(fast, now=None):
+    delta_seconds = ((now or datetime.utcnow()) - fast['start_time']).total_seconds()
+    return max(0, delta_seconds / 3600)
+
+def fast_progress(fast, now=None):
+    if not fast['target_hours']:
+        return 100
+    return min(100, (elapsed_hours(fast, now) / fast['target_hours']) * 100)
+
+def fast_payload(fast):
+    """JSON-ready description of a fast; clients compute elapsed time themselves."""
+    if fast is None:
+        return {'active': False}
+    return {
+        'active': True,
+        'id': fast['id'],
+        'start_time': fast['start_time'].isoformat() + 'Z',
+        'target_hours': fast['target_hours']
+    }
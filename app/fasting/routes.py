@@ -1,96 +1,79 @@
-from flask import render_template, redirect, url_for, flash, request, jsonify
+from flask import render_template, redirect, url_for, flash, request, jsonify, current_app, stream_with_context, abort
 from flask_login import login_required, current_user
 from app.extensions import db
 from app.fasting import bp
 from app.fasting.forms import FastingSessionForm
-from app.models import FastingSession
+from app.models import FastingSession, FastingState
+from app.pagination import date_keyset_page, fragment_response
+from app.fasting.streaks import record_completed_session, record_deleted_session
+from app.fasting.live import get_active_fast, notify_fast_changed, last_change, stream_slots, elapsed_hours, fast_progress, fast_payload
+from app.replica import replica_reads
 from datetime import datetime, timedelta
-from sqlalchemy import func
+import json
+import time
+from sqlalchemy import func, case, or_
 
+@replica_reads()
 def calculate_fasting_stats(user_id):
-    # Get all completed fasting sessions
-    completed_sessions = FastingSession.query.filter_by(
-        user_id=user_id,
-        completed=True
-    ).all()
-    
-    if not completed_sessions:
-        return None
-        
-    total_fasts = len(completed_sessions)
-    total_hours = sum(session.duration for session in completed_sessions)
-    avg_duration = total_hours / total_fasts
-    longest_fast = max(completed_sessions, key=lambda x: x.duration)
-    
-    # Modify this line to handle None values for target_hours
-    success_rate = len([s for s in completed_sessions if s.target_hours is None or s.duration >= s.target_hours]) / total_fasts * 100
-    
-    # Calculate weekly stats
     week_ago = datetime.utcnow() - timedelta(days=7)
-    weekly_sessions = [s for s in completed_sessions if s.start_time >= week_ago]
-    weekly_hours = sum(session.duration for session in weekly_sessions)
-    
-    # Calculate monthly stats
     month_ago = datetime.utcnow() - timedelta(days=30)
-    monthly_sessions = [s for s in completed_sessions if s.start_time >= month_ago]
-    monthly_hours = sum(session.duration for session in monthly_sessions)
-    
+    succeeded = or_(FastingSession.target_hours.is_(None),
+                    FastingSession.duration_hours >= FastingSession.target_hours)
+
+    # Aggregate all completed sessions in a single query over the stored durations
+    totals = db.session.query(
+        func.count(FastingSession.id).label('total_fasts'),
+        func.sum(FastingSession.duration_hours).label('total_hours'),
+        func.sum(case((succeeded, 1), else_=0)).label('successful_fasts'),
+        func.sum(case((FastingSession.start_time >= week_ago, FastingSession.duration_hours), else_=0)).label('weekly_hours'),
+        func.sum(case((FastingSession.start_time >= week_ago, 1), else_=0)).label('weekly_sessions'),
+        func.sum(case((FastingSession.start_time >= month_ago, FastingSession.duration_hours), else_=0)).label('monthly_hours'),
+        func.sum(case((FastingSession.start_time >= month_ago, 1), else_=0)).label('monthly_sessions')
+    ).filter(
+        FastingSession.user_id == user_id,
+        FastingSession.completed == True
+    ).one()
+
+    if not totals.total_fasts:
+        return None
+
+    longest_fast = FastingSession.query.filter_by(
+        user_id=user_id,
+        completed=True
+    ).order_by(FastingSession.duration_hours.desc(), FastingSession.id.asc()).first()
+
     return {
-        'total_fasts': total_fasts,
-        'total_hours': total_hours,
-        'avg_duration': avg_duration,
+        'total_fasts': totals.total_fasts,
+        'total_hours': totals.total_hours,
+        'avg_duration': totals.total_hours / totals.total_fasts,
         'longest_fast': longest_fast,
-        'success_rate': success_rate,
-        'weekly_hours': weekly_hours,
-        'monthly_hours': monthly_hours,
-        'weekly_sessions': len(weekly_sessions),
-        'monthly_sessions': len(monthly_sessions)
+        'success_rate': totals.successful_fasts / totals.total_fasts * 100,
+        'weekly_hours': totals.weekly_hours,
+        'monthly_hours': totals.monthly_hours,
+        'weekly_sessions': totals.weekly_sessions,
+        'monthly_sessions': totals.monthly_sessions
     }
 
-def calculate_streaks(user_id):
-    completed_sessions = FastingSession.query.filter_by(
-        user_id=user_id,
-        completed=True
-    ).order_by(FastingSession.start_time.desc()).all()
-    
-    if not completed_sessions:
+def calculate_streaks(user_id, weekly_sessions):
+    state = db.session.get(FastingState, user_id)
+    if state is None:
         return None
-    
-    # Calculate current/best streaks of successful fasts (reaching target)
-    current_streak = 0
-    best_streak = 0
-    temp_streak = 0
-    
-    for session in completed_sessions:
-        # Consider a fast successful if target_hours is None or the duration meets/exceeds the target
-        if session.target_hours is None or session.duration >= session.target_hours:
-            temp_streak += 1
-            if temp_streak > best_streak:
-                best_streak = temp_streak
-        else:
-            if current_streak == 0:  # Only update current streak if we haven't broken it yet
-                current_streak = temp_streak
-            temp_streak = 0
-    
-    if current_streak == 0:  # If we never broke the streak
-        current_streak = temp_streak
-    
-    # Calculate consistency (fasts completed in last 7 days)
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    weekly_sessions = FastingSession.query.filter(
-        FastingSession.user_id == user_id,
-        FastingSession.completed == True,
-        FastingSession.start_time >= week_ago
-    ).count()
-    
+
+    # Consistency: fasts completed in the last 7 days, as counted by calculate_fasting_stats
     consistency = (weekly_sessions / 7) * 100  # Percentage of days with completed fasts
-    
+
     return {
-        'current_streak': current_streak,
-        'best_streak': best_streak,
+        'current_streak': state.current_streak,
+        'best_streak': state.best_streak,
         'weekly_consistency': consistency
     }
 
+@replica_reads()
+def fasting_history_page(user_id, cursor):
+    query = FastingSession.query.filter_by(user_id=user_id, completed=True)
+    return date_keyset_page(query, FastingSession.start_time, FastingSession.id, cursor,
+                            current_app.config['HISTORY_PAGE_SIZE'])
+
 @bp.route('/tracker', methods=['GET', 'POST'])
 @login_required
 def tracker():
@@ -102,15 +85,12 @@ def tracker():
         completed=False
     ).order_by(FastingSession.start_time.desc()).first()
 
-    # Get fasting history
-    fasting_history = FastingSession.query.filter_by(
-        user_id=current_user.id,
-        completed=True
-    ).order_by(FastingSession.start_time.desc()).all()
+    # Only the first page of history is rendered; older sessions come from fasting.history_rows
+    history = fasting_history_page(current_user.id, None)
 
     # Calculate statistics and streaks
     stats = calculate_fasting_stats(current_user.id)
-    streaks = calculate_streaks(current_user.id)
+    streaks = calculate_streaks(current_user.id, stats['weekly_sessions']) if stats else None
 
     if form.validate_on_submit():
         if current_fast:
@@ -128,21 +108,31 @@ def tracker():
         session = FastingSession(
             start_time=datetime.utcnow(),
             target_hours=target_hours,
-            user=current_user
+            user_id=current_user.id
         )
         db.session.add(session)
         db.session.commit()
+        notify_fast_changed(current_user.id, 'started')
         flash('Fasting session started!', 'success')
         return redirect(url_for('fasting.tracker'))
 
     return render_template('fasting_tracker.html',
                          form=form,
                          current_fast=current_fast,
-                         fasting_history=fasting_history,
+                         history=history,
                          stats=stats,
                          streaks=streaks,
                          timedelta=timedelta)
 
+@bp.route('/history')
+@login_required
+def history_rows():
+    """Next page of the fasting history as an HTML fragment for "Load more"."""
+    history = fasting_history_page(current_user.id, request.args.get('cursor'))
+    html = render_template('fasting/_history_rows.html', sessions=history.items)
+    next_url = url_for('fasting.history_rows', cursor=history.next_cursor) if history.has_more else None
+    return fragment_response(html, next_url)
+
 @bp.route('/end/<int:session_id>', methods=['POST'])
 @login_required
 def end_session(session_id):
@@ -155,9 +145,10 @@ def end_session(session_id):
         flash('This fasting session is already completed.', 'error')
         return redirect(url_for('fasting.tracker'))
 
-    session.end_time = datetime.utcnow()
-    session.completed = True
+    session.finish()
+    record_completed_session(session)
     db.session.commit()
+    notify_fast_changed(current_user.id, 'ended')
 
     duration = session.duration
     message = f'Fasting session completed! Duration: {duration:.1f} hours'
@@ -184,6 +175,7 @@ def cancel_session(session_id):
 
     db.session.delete(session)
     db.session.commit()
+    notify_fast_changed(current_user.id, 'cancelled')
     flash('Fasting session cancelled.', 'success')
     return redirect(url_for('fasting.tracker'))
 
@@ -200,6 +192,8 @@ def delete_session(session_id):
         return redirect(url_for('fasting.tracker'))
 
     db.session.delete(session)
+    db.session.flush()
+    record_deleted_session(session)
     db.session.commit()
     flash('Fasting session deleted.', 'success')
     return redirect(url_for('fasting.tracker'))
@@ -207,10 +201,7 @@ def delete_session(session_id):
 @bp.route('/status')
 @login_required
 def status():
-    current_fast = FastingSession.query.filter_by(
-        user_id=current_user.id,
-        completed=False
-    ).order_by(FastingSession.start_time.desc()).first()
+    current_fast = get_active_fast(current_user.id)
 
     if not current_fast:
         return jsonify({
@@ -220,11 +211,80 @@ def status():
 
     return jsonify({
         'active': True,
-        'duration': current_fast.duration,
-        'target_hours': current_fast.target_hours,
-        'progress': current_fast.progress
+        'id': current_fast['id'],
+        'duration': elapsed_hours(current_fast),
+        'target_hours': current_fast['target_hours'],
+        'progress': fast_progress(current_fast)
     })
 
+@bp.route('/stream')
+@login_required
+def stream():
+    """Server-Sent Events: the fast state once, then only changes to it.
+
+    Each open stream holds a worker thread, so streams are off unless
+    FASTING_STREAM_ENABLED is set, at most FASTING_STREAM_MAX_PER_PROCESS are
+    open per process (pages fall back to polling /fasting/status when refused),
+    and each ends after FASTING_STREAM_TIMEOUT seconds for the browser to
+    reconnect.
+    """
+    if not current_app.config['FASTING_STREAM_ENABLED']:
+        abort(404)
+    slots = stream_slots()
+    if not slots.acquire(blocking=False):
+        response = current_app.response_class('Too many open streams', status=503, mimetype='text/plain')
+        response.headers['Retry-After'] = str(current_app.config['FASTING_STREAM_TIMEOUT'])
+        return response
+
+    user_id = current_user.id
+    poll_interval = current_app.config['FASTING_STREAM_POLL_INTERVAL']
+    timeout = current_app.config['FASTING_STREAM_TIMEOUT']
+
+    def event(name, fast):
+        return f'event: {name}\ndata: {json.dumps(fast_payload(fast))}\n\n'
+
+    def target_reached(fast):
+        return bool(fast and fast['target_hours'] and elapsed_hours(fast) >= fast['target_hours'])
+
+    def generate():
+        sequence, _ = last_change(user_id)
+        fast = get_active_fast(user_id)
+        db.session.remove()
+        reached = target_reached(fast)
+        yield event('state', fast)
+
+        started = time.monotonic()
+        last_sent = started
+        while time.monotonic() - started < timeout:
+            time.sleep(poll_interval)
+
+            new_sequence, change = last_change(user_id)
+            new_fast = get_active_fast(user_id)
+            db.session.remove()
+            if new_sequence != sequence or (new_fast and new_fast['id']) != (fast and fast['id']):
+                # Changes made through another worker only show up once the
+                # cache expires, and without the event name that was recorded
+                if new_sequence == sequence or change is None:
+                    change = 'started' if new_fast else 'ended'
+                sequence, fast = new_sequence, new_fast
+                reached = target_reached(fast)
+                last_sent = time.monotonic()
+                yield event(change, fast)
+            elif not reached and target_reached(fast):
+                reached = True
+                last_sent = time.monotonic()
+                yield event('target_reached', fast)
+            elif time.monotonic() - last_sent >= 15:
+                last_sent = time.monotonic()
+                yield ': keep-alive\n\n'
+
+    response = current_app.response_class(stream_with_context(generate()), mimetype='text/event-stream')
+    # Released when the server closes the response, even if the body was never read
+    response.call_on_close(slots.release)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @bp.route('/end_fast', methods=['POST'])
 @login_required
 def end_fast():
@@ -238,9 +298,10 @@ def end_fast():
         flash('No active fasting session found.', 'error')
         return redirect(url_for('fasting.tracker'))
     
-    current_fast.end_time = datetime.utcnow()
-    current_fast.completed = True
+    current_fast.finish()
+    record_completed_session(current_fast)
     db.session.commit()
+    notify_fast_changed(current_user.id, 'ended')
     
     duration = current_fast.duration
     message = f'Fasting session completed! Duration: {duration:.1f} hours'
@@ -278,10 +339,11 @@ def start_fast():
     session = FastingSession(
         start_time=datetime.utcnow(),
         target_hours=target_hours,
-        user=current_user
+        user_id=current_user.id
     )
     db.session.add(session)
     db.session.commit()
+    notify_fast_changed(current_user.id, 'started')
     
     flash('Fasting session started!', 'success')
     return redirect(url_for('fasting.tracker'))
\ No newline at end of file
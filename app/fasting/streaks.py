@@ -0,0 +1,60 @@
+from app.extensions import db
+from app.models import FastingSession, FastingState
+
+def is_successful(target_hours, duration_hours):
+    """A fast succeeds when it has no target or reaches it."""
+    return target_hours is None or duration_hours >= target_hours
+
+def recompute_fasting_state(user_id):
+    """Rebuild a user's streak state from their full completed-fast history."""
+    state = db.session.get(FastingState, user_id) or FastingState(user_id=user_id)
+    state.current_streak = 0
+    state.best_streak = 0
+    state.last_success_at = None
+    state.last_session_start = None
+
+    sessions = db.session.query(
+        FastingSession.start_time,
+        FastingSession.end_time,
+        FastingSession.target_hours,
+        FastingSession.duration_hours
+    ).filter(
+        FastingSession.user_id == user_id,
+        FastingSession.completed == True
+    ).order_by(FastingSession.start_time.asc())
+
+    for session in sessions:
+        if is_successful(session.target_hours, session.duration_hours):
+            state.current_streak += 1
+            state.best_streak = max(state.best_streak, state.current_streak)
+            state.last_success_at = session.end_time
+        else:
+            state.current_streak = 0
+        state.last_session_start = session.start_time
+
+    db.session.add(state)
+    return state
+
+def record_completed_session(session):
+    """Count a just-finished fast into its owner's streaks in O(1)."""
+    state = db.session.get(FastingState, session.user_id)
+    if state is None or (state.last_session_start and session.start_time < state.last_session_start):
+        # No state yet, or the fast is older than the latest one counted
+        return recompute_fasting_state(session.user_id)
+
+    if is_successful(session.target_hours, session.duration_hours):
+        state.current_streak += 1
+        state.best_streak = max(state.best_streak, state.current_streak)
+        state.last_success_at = session.end_time
+    else:
+        state.current_streak = 0
+    state.last_session_start = session.start_time
+    return state
+
+def record_deleted_session(session):
+    """Update streaks after a completed fast has been deleted.
+
+    The counters cannot be rolled back past a removed fast, so this rebuilds
+    the state from the remaining history. Call it after the delete is flushed.
+    """
+    return recompute_fasting_state(session.user_id)
@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+class PasswordHashingBusy(RuntimeError):
+    """Raised when the hashing pool is full, so the request can be refused instead of queued."""
+
+class _HashingPool:
+    def __init__(self, workers, max_pending, timeout):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        # Admission control: at most max_pending hashes running or waiting at once
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.timeout = timeout
+
+    def run(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHashingBusy('Too many password checks in progress')
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHashingBusy('Timed out waiting for a password hashing slot')
+
+class PasswordHasher:
+    """Runs password hashing on a small bounded pool with admission control.
+
+    PBKDF2 keeps a CPU core busy for a long time per call. Running every hash
+    on PASSWORD_HASH_WORKERS threads, and refusing new work once
+    PASSWORD_HASH_MAX_PENDING calls are running or queued, stops a burst of
+    logins from tying up every request thread. That limit is kept below
+    WORKER_THREADS, so other pages stay responsive and the extra logins fail
+    fast with PasswordHashingBusy.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        threads = app.config.get('WORKER_THREADS', 1)
+        max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING') or max(1, threads // 2)
+        if threads > 1 and max_pending >= threads:
+            # Admitting as many logins as there are request threads would let a burst take them all
+            app.logger.warning('PASSWORD_HASH_MAX_PENDING=%s is not below WORKER_THREADS=%s; using %s',
+                               max_pending, threads, threads - 1)
+            max_pending = threads - 1
+        app.extensions['password_hasher'] = _HashingPool(
+            workers=app.config['PASSWORD_HASH_WORKERS'],
+            max_pending=max_pending,
+            timeout=app.config['PASSWORD_HASH_TIMEOUT']
+        )
+        app.register_error_handler(PasswordHashingBusy, self._busy_response)
+
+    @staticmethod
+    def _busy_response(error):
+        response = current_app.response_class('The server is busy. Please try again in a moment.', status=503)
+        response.headers['Retry-After'] = '1'
+        return response
+
+    def _run(self, fn, *args):
+        pool = current_app.extensions.get('password_hasher') if has_app_context() else None
+        if pool is None:
+            return fn(*args)
+        return pool.run(fn, *args)
+
+    def hash(self, password):
+        method = current_app.config['PASSWORD_HASH_METHOD'] if has_app_context() else 'pbkdf2'
+        return self._run(generate_password_hash, password, method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with different parameters than PASSWORD_HASH_METHOD."""
+        return password_hash.split('$', 1)[0] != current_app.config['PASSWORD_HASH_METHOD']
@@ -0,0 +1,79 @@
+import threading
+from flask_login import UserMixin
+from app.extensions import db
+from app.cache import TTLCache, app_cache
+
+class UserSnapshot(UserMixin):
+    """Detached, read-only copy of the User columns that pages read from current_user.
+
+    Code that needs to change the user, or check a password, loads the real
+    User with db.session.get(User, current_user.id).
+    """
+
+    def __init__(self, user, version):
+        self.id = user.id
+        self.username = user.username
+        self.email = user.email
+        self.height = user.height
+        self.is_admin = bool(user.is_admin)
+        self.version = version
+
+    def __repr__(self):
+        return f'<UserSnapshot {self.username}>'
+
+class IdentityCache:
+    """Per-process LRU of user snapshots, checked against an in-process version per user.
+
+    Writers bump the version after committing, so this process stops serving
+    the old snapshot immediately (even one loaded concurrently from a row read
+    just before the commit). Other processes pick the change up once their
+    copy's TTL expires, which bounds how long a revoked permission can linger.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._snapshots = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def version(self, user_id):
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def get(self, user_id):
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is not None and snapshot.version == self.version(user_id):
+            return snapshot
+        return None
+
+    def set(self, snapshot):
+        self._snapshots.set(snapshot.id, snapshot)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self._snapshots.pop(user_id)
+
+def identity_cache():
+    return app_cache('identity_cache', 'IDENTITY_CACHE_SIZE', 'IDENTITY_CACHE_TTL', factory=IdentityCache)
+
+def load_identity(user_id):
+    """Return a cached UserSnapshot for user_id, or None if the user does not exist."""
+    from app.models import User
+
+    cache = identity_cache()
+    snapshot = cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+    # Read the version before the row, so a write that lands in between leaves
+    # this snapshot already stale rather than cached as current
+    version = cache.version(user_id)
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    snapshot = UserSnapshot(user, version)
+    cache.set(snapshot)
+    return snapshot
+
+def invalidate_identity(user_id):
+    """Drop the cached snapshot of a user whose account details just changed."""
+    identity_cache().invalidate(user_id)
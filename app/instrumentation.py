@@ -0,0 +1,87 @@
+import logging
+import os
+import time
+from flask import g, request, has_request_context, before_render_template, template_rendered
+from sqlalchemy import event
+
+slow_query_logger = logging.getLogger('app.slow_queries')
+
+def _redact(parameters):
+    """Describe bound parameters by type only so no user data reaches the log."""
+    if parameters is None:
+        return []
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return f'<{len(parameters)} parameter sets>'
+    return [type(value).__name__ for value in parameters]
+
+class SQLInstrumentation:
+    """Per-request SQL timing, Server-Timing headers and a slow-query log.
+
+    Nothing is registered unless SQL_INSTRUMENTATION is enabled, so a
+    disabled instance adds no overhead to queries or requests.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('SQL_INSTRUMENTATION'):
+            return
+
+        self.threshold = app.config.get('SLOW_QUERY_THRESHOLD_MS', 100) / 1000
+        log_path = app.config.get('SLOW_QUERY_LOG')
+        if log_path and not any(getattr(h, 'baseFilename', None) == os.path.abspath(log_path)
+                                for h in slow_query_logger.handlers):
+            handler = logging.FileHandler(log_path)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            slow_query_logger.addHandler(handler)
+            slow_query_logger.setLevel(logging.INFO)
+
+        from app.extensions import db
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+        app.before_request(self._start_request)
+        app.after_request(self._add_server_timing)
+
+    def _start_request(self):
+        g.request_started = time.perf_counter()
+        g.sql_time = 0.0
+        g.sql_count = 0
+        g.template_time = 0.0
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        if not has_request_context() or 'sql_time' not in g:
+            return
+        g.sql_time += elapsed
+        g.sql_count += 1
+        if elapsed >= self.threshold:
+            slow_query_logger.warning('%.1f ms %s %s params=%s', elapsed * 1000, request.endpoint,
+                                      ' '.join(statement.split()), _redact(parameters))
+
+    def _before_render(self, sender, template, context, **extra):
+        g.template_started = time.perf_counter()
+
+    def _after_render(self, sender, template, context, **extra):
+        if 'template_started' in g:
+            g.template_time += time.perf_counter() - g.pop('template_started')
+
+    def _add_server_timing(self, response):
+        if 'request_started' not in g:
+            return response
+        total = time.perf_counter() - g.request_started
+        response.headers.add('Server-Timing', f'db;dur={g.sql_time * 1000:.2f};desc="{g.sql_count} queries"')
+        response.headers.add('Server-Timing', f'render;dur={g.template_time * 1000:.2f}')
+        response.headers.add('Server-Timing', f'total;dur={total * 1000:.2f}')
+        return response
@@ -1,14 +1,18 @@
 from flask import render_template, redirect, url_for, send_from_directory, request, flash
 from flask_login import login_required, current_user
 from app.main import bp
-from app.models import WeightEntry, CalorieEntry
+from app.models import User, WeightEntry, WeightGoal, DailyNutrition, get_data_version
+from app.identity import invalidate_identity
+from app.weight.forecast import goal_forecast
+from app.cache import app_cache
 from datetime import datetime, timedelta
 from app.main.forms import ProfileForm
 from app.extensions import db
 
 @bp.route('/favicon.ico')
 def favicon():
-    return send_from_directory('static/images', 'favicon.ico')
+    # Browsers request this fixed URL, so it can't be fingerprinted; pages link the hashed copy
+    return send_from_directory('static/images', 'favicon.ico', max_age=86400)
 
 @bp.route('/')
 def index():
@@ -16,55 +20,65 @@ def index():
         return redirect(url_for('main.dashboard'))
     return redirect(url_for('auth.login'))
 
-@bp.route('/dashboard')
-@login_required
-def dashboard():
+def dashboard_cache():
+    """Per-app LRU cache of computed dashboard contexts, keyed by user."""
+    return app_cache('dashboard_cache', 'DASHBOARD_CACHE_SIZE', 'DASHBOARD_CACHE_TTL')
+
+def build_dashboard_context(user_id):
     # Get current weight and change
-    latest_weight = WeightEntry.query.filter_by(user_id=current_user.id).order_by(WeightEntry.date.desc()).first()
+    latest_weight = WeightEntry.query.filter_by(user_id=user_id).order_by(WeightEntry.date.desc()).first()
     week_ago_weight = WeightEntry.query.filter(
-        WeightEntry.user_id == current_user.id,
+        WeightEntry.user_id == user_id,
         WeightEntry.date <= datetime.utcnow() - timedelta(days=7)
     ).order_by(WeightEntry.date.desc()).first()
     
     current_weight = latest_weight.weight if latest_weight else None
     weight_change = (latest_weight.weight - week_ago_weight.weight) if latest_weight and week_ago_weight else None
 
-    # Get weight history for the chart (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    weight_entries = WeightEntry.query.filter(
-        WeightEntry.user_id == current_user.id,
-        WeightEntry.date >= thirty_days_ago
-    ).order_by(WeightEntry.date.asc()).all()
+    # Get calories for today from the daily rollup
+    today_totals = db.session.get(DailyNutrition, (user_id, datetime.utcnow().date()))
+    calories_today = today_totals.calories if today_totals else 0
 
-    dates = []
-    weights = []
-    if weight_entries:
-        for entry in weight_entries:
-            dates.append(entry.date.strftime('%Y-%m-%d'))
-            weights.append(entry.weight)
+    # Projected goal date from the stored regression sums
+    active_goal = WeightGoal.query.filter_by(user_id=user_id, active=True).first()
+    forecast = goal_forecast(user_id, active_goal) if active_goal and not active_goal.completed else None
 
-    # Get calories for today
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    calories_today = sum(entry.calories for entry in CalorieEntry.query.filter(
-        CalorieEntry.user_id == current_user.id,
-        CalorieEntry.date >= today_start
-    ).all())
+    return {
+        'current_weight': current_weight,
+        'weight_change': weight_change,
+        'calories_today': calories_today,
+        'goal_target_weight': active_goal.target_weight if active_goal else None,
+        'forecast': forecast
+    }
+
+@bp.route('/dashboard')
+@login_required
+def dashboard():
+    # Cached contexts are only reused while the user's data version and the
+    # day are unchanged, so a write is visible on the very next request
+    cache = dashboard_cache()
+    key = (get_data_version(current_user.id), datetime.utcnow().date())
+    cached = cache.get(current_user.id)
+    if cached and cached[0] == key:
+        context = cached[1]
+    else:
+        context = build_dashboard_context(current_user.id)
+        cache.set(current_user.id, (key, context))
 
+    # The 30-day chart series is loaded from weight.chart_data, which has its own ETag
     return render_template('dashboard.html',
-                         current_weight=current_weight,
-                         weight_change=weight_change,
-                         calories_today=calories_today,
                          daily_calorie_goal=2500,  # This should be customizable per user
-                         dates=dates,
-                         weights=weights)
+                         **context)
 
 @bp.route('/profile', methods=['GET', 'POST'])
 @login_required
 def profile():
     form = ProfileForm()
     if form.validate_on_submit():
-        current_user.height = form.height.data
+        user = db.session.get(User, current_user.id)
+        user.height = form.height.data
         db.session.commit()
+        invalidate_identity(user.id)
         flash('Your profile has been updated.', 'success')
         return redirect(url_for('main.profile'))
     elif request.method == 'GET':
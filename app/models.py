@@ -1,31 +1,43 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
-from app.extensions import db, login
+from app.extensions import db, login, password_hasher
 
 @login.user_loader
 def load_user(id):
-    return User.query.get(int(id))
+    # Served from the identity cache; current_user is a UserSnapshot, not a User
+    from app.identity import load_identity
+    return load_identity(int(id))
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(64), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128))
+    password_hash = db.Column(db.String(256))
     height = db.Column(db.Float, nullable=True)  # Height in centimeters
     is_admin = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime)
+    data_version = db.Column(db.Integer, default=0, nullable=False, server_default='0')  # Bumped on every tracked-data write
+    weight_version = db.Column(db.Integer, default=0, nullable=False, server_default='0')  # Bumped only on weight-entry writes
+
     weight_entries = db.relationship('WeightEntry', backref='user', lazy='dynamic')
     calorie_entries = db.relationship('CalorieEntry', backref='user', lazy='dynamic')
     weight_goals = db.relationship('WeightGoal', backref='user', lazy='dynamic')
     fasting_sessions = db.relationship('FastingSession', backref='user', lazy='dynamic')
+
+    __table_args__ = (
+        db.Index('ix_user_is_admin', 'is_admin'),
+        db.Index('ix_user_last_login', 'last_login'),
+    )
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
     
     def make_admin(self):
         self.is_admin = True
@@ -33,12 +45,36 @@ class User(UserMixin, db.Model):
     def remove_admin(self):
         self.is_admin = False
 
+def get_data_version(user_id):
+    """Read a user's data version straight from the database."""
+    return db.session.query(User.data_version).filter(User.id == user_id).scalar() or 0
+
+def get_weight_version(user_id):
+    """Read a user's weight version, which only weight-entry writes move."""
+    return db.session.query(User.weight_version).filter(User.id == user_id).scalar() or 0
+
+def bump_data_version(user_id, weights=False):
+    """Increment a user's data version so cached views of their data are invalidated.
+
+    Pass weights=True for writes to weight entries, which also bumps the
+    weight version that weight-only caches such as the trend are keyed on.
+    """
+    values = {User.data_version: User.data_version + 1}
+    if weights:
+        values[User.weight_version] = User.weight_version + 1
+    User.query.filter_by(id=user_id).update(values)
+
 class WeightEntry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     weight = db.Column(db.Float, nullable=False)
     date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_weight_entry_user_id_date', 'user_id', 'date'),
+        db.Index('ix_weight_entry_date', 'date'),
+    )
+
 class WeightGoal(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     start_weight = db.Column(db.Float, nullable=False)
@@ -50,6 +86,10 @@ class WeightGoal(db.Model):
     active = db.Column(db.Boolean, default=True)
     completed = db.Column(db.Boolean, default=False)
 
+    __table_args__ = (
+        db.Index('ix_weight_goal_user_id_active', 'user_id', 'active'),
+    )
+
     @property
     def daily_goal(self):
         total_days = (self.target_date - self.start_date).days
@@ -66,6 +106,27 @@ class WeightGoal(db.Model):
     def monthly_goal(self):
         return self.daily_goal * 30
 
+class WeightForecast(db.Model):
+    """Running least-squares sums over a user's recent weights, for projecting goal dates.
+
+    t is measured in days since `origin`. Entries dated from `window_start`
+    on are counted; the window start only moves forward as entries are added.
+    """
+    __tablename__ = 'weight_forecast'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    origin = db.Column(db.DateTime, nullable=False)
+    window_start = db.Column(db.DateTime, nullable=False)
+    last_date = db.Column(db.DateTime)  # Latest entry counted; forecasts are made from here
+    count = db.Column(db.Integer, default=0, nullable=False)
+    sum_t = db.Column(db.Float, default=0, nullable=False)
+    sum_w = db.Column(db.Float, default=0, nullable=False)
+    sum_tw = db.Column(db.Float, default=0, nullable=False)
+    sum_tt = db.Column(db.Float, default=0, nullable=False)
+    sum_ww = db.Column(db.Float, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<WeightForecast {self.user_id} - {self.count} entries>'
+
 class CalorieEntry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     food_name = db.Column(db.String(100), nullable=False)
@@ -78,19 +139,71 @@ class CalorieEntry(db.Model):
     date = db.Column(db.DateTime, default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_calorie_entry_user_id_date', 'user_id', 'date'),
+        db.Index('ix_calorie_entry_date', 'date'),
+    )
+
     def __repr__(self):
         return f'<CalorieEntry {self.food_name} - {self.calories}kcal>'
 
+class DailyNutrition(db.Model):
+    """Per-user daily totals of CalorieEntry rows, kept in step by the calories blueprint."""
+    __tablename__ = 'daily_nutrition'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    calories = db.Column(db.Integer, default=0, nullable=False)
+    protein = db.Column(db.Float, default=0, nullable=False)
+    carbs = db.Column(db.Float, default=0, nullable=False)
+    fat = db.Column(db.Float, default=0, nullable=False)
+    fiber = db.Column(db.Float, default=0, nullable=False)
+    entry_count = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<DailyNutrition {self.user_id} {self.day} - {self.calories}kcal>'
+
+class FoodCatalog(db.Model):
+    """Each food a user has logged, with the values from its latest use, for autocomplete."""
+    __tablename__ = 'food_catalog'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    name_key = db.Column(db.String(100), primary_key=True)  # Normalized name; the primary key doubles as the prefix index
+    food_name = db.Column(db.String(100), nullable=False)
+    calories = db.Column(db.Integer, nullable=False)
+    meal_type = db.Column(db.String(20), nullable=False)
+    protein = db.Column(db.Float, default=0, nullable=False)
+    carbs = db.Column(db.Float, default=0, nullable=False)
+    fat = db.Column(db.Float, default=0, nullable=False)
+    fiber = db.Column(db.Float, default=0, nullable=False)
+    use_count = db.Column(db.Integer, default=0, nullable=False)
+    last_used_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<FoodCatalog {self.user_id} {self.food_name}>'
+
 class FastingSession(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     start_time = db.Column(db.DateTime, nullable=False)
     end_time = db.Column(db.DateTime)
     target_hours = db.Column(db.Integer, nullable=True)
     completed = db.Column(db.Boolean, default=False)
+    duration_hours = db.Column(db.Float, nullable=True)  # Stored when the fast ends
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_fasting_session_user_id_completed_start_time', 'user_id', 'completed', 'start_time'),
+        db.Index('ix_fasting_session_start_time', 'start_time'),
+    )
+
+    def finish(self, end_time=None):
+        """End the fast and store its duration."""
+        self.end_time = end_time or datetime.utcnow()
+        self.completed = True
+        self.duration_hours = (self.end_time - self.start_time).total_seconds() / 3600
+
     @property
     def duration(self):
+        if self.duration_hours is not None:
+            return self.duration_hours
         if self.end_time:
             return (self.end_time - self.start_time).total_seconds() / 3600
         # For an ongoing fast, ensure duration is not negative due to millisecond race conditions
@@ -113,4 +226,16 @@ class FastingSession(db.Model):
         if not self.target_hours:
             return 100
         current_duration = self.duration
-        return min(100, (current_duration / self.target_hours) * 100)
\ No newline at end of file
+        return min(100, (current_duration / self.target_hours) * 100)
+
+class FastingState(db.Model):
+    """Per-user fasting streaks, updated whenever a fast ends or is deleted."""
+    __tablename__ = 'fasting_state'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    current_streak = db.Column(db.Integer, default=0, nullable=False)
+    best_streak = db.Column(db.Integer, default=0, nullable=False)
+    last_success_at = db.Column(db.DateTime)  # End time of the latest successful fast
+    last_session_start = db.Column(db.DateTime)  # Start time of the latest completed fast counted
+
+    def __repr__(self):
+        return f'<FastingState {self.user_id} - {self.current_streak}/{self.best_streak}>'
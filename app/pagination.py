@@ -0,0 +1,71 @@
+from datetime import datetime
+from flask import make_response
+from sqlalchemy import and_, or_
+
+CURSOR_DATE_FORMAT = '%Y%m%d%H%M%S%f'
+
+class KeysetPage:
+    """One page of keyset-paginated rows plus the cursor for the page after it."""
+
+    def __init__(self, items, next_cursor, following=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        # First row of the next page, for templates that compare each row with the one below it
+        self.following = following
+
+    @property
+    def has_more(self):
+        return self.next_cursor is not None
+
+def encode_cursor(*values):
+    return '_'.join(value.strftime(CURSOR_DATE_FORMAT) if isinstance(value, datetime) else str(value)
+                    for value in values)
+
+def decode_date_cursor(cursor):
+    """Parse a '<date>_<id>' cursor, returning None for a missing or malformed one."""
+    try:
+        date_part, id_part = cursor.split('_')
+        return datetime.strptime(date_part, CURSOR_DATE_FORMAT), int(id_part)
+    except (AttributeError, ValueError):
+        return None
+
+def decode_id_cursor(cursor):
+    try:
+        return int(cursor)
+    except (TypeError, ValueError):
+        return None
+
+def date_keyset_page(query, date_column, id_column, cursor, per_page):
+    """Return the page of `query` after `cursor`, newest first, ordered by (date, id).
+
+    Rows are located with a WHERE on the (date, id) pair rather than an
+    OFFSET, so every page costs the same however deep into the history it is.
+    """
+    position = decode_date_cursor(cursor)
+    if position is not None:
+        date, row_id = position
+        query = query.filter(or_(date_column < date, and_(date_column == date, id_column < row_id)))
+    rows = query.order_by(date_column.desc(), id_column.desc()).limit(per_page + 1).all()
+    items, following = rows[:per_page], rows[per_page] if len(rows) > per_page else None
+    next_cursor = None
+    if following is not None:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, date_column.key), getattr(last, id_column.key))
+    return KeysetPage(items, next_cursor, following)
+
+def id_keyset_page(query, id_column, cursor, per_page):
+    """Return the page of `query` after `cursor`, in ascending id order."""
+    after = decode_id_cursor(cursor)
+    if after is not None:
+        query = query.filter(id_column > after)
+    rows = query.order_by(id_column).limit(per_page + 1).all()
+    items, following = rows[:per_page], rows[per_page] if len(rows) > per_page else None
+    next_cursor = encode_cursor(getattr(items[-1], id_column.key)) if following is not None else None
+    return KeysetPage(items, next_cursor, following)
+
+def fragment_response(html, next_url):
+    """Wrap a "Load more" fragment, passing the URL of the page after it in X-Next-Page."""
+    response = make_response(html)
+    if next_url:
+        response.headers['X-Next-Page'] = next_url
+    return response
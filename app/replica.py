@@ -0,0 +1,103 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+import click
+from flask import current_app, has_request_context, session as flask_session
+from flask.cli import with_appcontext
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select, event
+
+REPLICA_BIND = 'replica'
+LAST_WRITE_KEY = '_last_write_at'
+
+class RoutingSession(Session):
+    """Session that sends reads made inside replica_reads() to the replica bind.
+
+    Everything else (writes, flushes, reads outside replica_reads(), and
+    any read once this session or the user's recent requests have written)
+    goes to the primary, so a user always reads their own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('replica_reads') and isinstance(clause, Select) \
+                and not self._flushing and self._replica_allowed():
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_allowed(self):
+        if self.info.get('wrote'):
+            return False
+        if has_request_context():
+            last_write = flask_session.get(LAST_WRITE_KEY)
+            window = current_app.config['REPLICA_READ_YOUR_WRITES_SECONDS']
+            if last_write and time.time() - last_write < window:
+                return False
+        return True
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_flush(session, flush_context):
+    session.info['wrote'] = True
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_bulk_write(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements such as bump_data_version skip the flush
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['wrote'] = True
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _remember_write(session):
+    # Remember the write in the user's cookie so their next requests skip the
+    # replica until it has had time to catch up
+    if session.info.get('wrote') and has_request_context():
+        flask_session[LAST_WRITE_KEY] = time.time()
+
+@contextmanager
+def replica_reads():
+    """Route the SELECTs run inside this block (or decorated function) to the replica, if one is configured."""
+    from app.extensions import db
+    info = db.session.info
+    info['replica_reads'] = info.get('replica_reads', 0) + 1
+    try:
+        yield
+    finally:
+        info['replica_reads'] -= 1
+
+def _sqlite_path(engine):
+    if engine.dialect.name != 'sqlite' or not engine.url.database:
+        raise click.ClickException('replica sync only copies file-based SQLite databases; '
+                                   'use your database server\'s replication instead.')
+    return engine.url.database
+
+def sync_replica():
+    """Copy the primary SQLite database over the replica with the online backup API."""
+    from app.extensions import db
+    engines = db.engines
+    if REPLICA_BIND not in engines:
+        raise click.ClickException('No replica configured; set REPLICA_DATABASE_URL.')
+    primary = sqlite3.connect(_sqlite_path(engines[None]))
+    replica = sqlite3.connect(_sqlite_path(engines[REPLICA_BIND]))
+    try:
+        primary.backup(replica)
+    finally:
+        replica.close()
+        primary.close()
+    # Pooled replica connections may still hold the old file contents
+    engines[REPLICA_BIND].dispose()
+
+@click.group('replica')
+def replica_cli():
+    """Local read-replica tools."""
+
+@replica_cli.command('sync')
+@click.option('--interval', type=float, help='Keep syncing every INTERVAL seconds, as a stand-in for replication.')
+@with_appcontext
+def sync_command(interval):
+    """Copy the primary SQLite database to the replica."""
+    while True:
+        sync_replica()
+        click.echo('Replica synced.')
+        if not interval:
+            return
+        time.sleep(interval)
@@ -0,0 +1,35 @@
+from sqlalchemy import event
+
+class SQLitePragmas:
+    """Apply the SQLITE_PRAGMAS config to every new SQLite connection.
+
+    PRAGMAs such as busy_timeout and cache_size only last for one connection,
+    so they are issued from the pool's connect event. Non-SQLite engines and
+    an empty SQLITE_PRAGMAS are left alone.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        pragmas = app.config.get('SQLITE_PRAGMAS')
+        if not pragmas:
+            return
+
+        from app.extensions import db
+        with app.app_context():
+            for engine in db.engines.values():
+                if engine.dialect.name == 'sqlite':
+                    event.listen(engine, 'connect', self._make_listener(dict(pragmas)))
+
+    @staticmethod
+    def _make_listener(pragmas):
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f'PRAGMA {name}={value}')
+            finally:
+                cursor.close()
+        return set_pragmas
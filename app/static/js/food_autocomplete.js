@@ -0,0 +1,67 @@
+// Food-name autocomplete for the calorie calculator: as the user types, fetch
+// matching foods from data-search-url into a <datalist>, and once the name
+// matches a suggestion fill in the calories, meal type and macros last used for it.
+(function() {
+    const input = document.querySelector('[data-food-search-url]');
+    if (!input) {
+        return;
+    }
+    const list = document.getElementById(input.getAttribute('list'));
+    const fields = ['calories', 'meal_type', 'protein', 'carbs', 'fat', 'fiber'];
+    let suggestions = {};
+    let timer = null;
+    let pending = null;
+
+    function fill(food) {
+        fields.forEach(function(name) {
+            const field = input.form.elements[name];
+            if (field && food[name] !== null && food[name] !== undefined) {
+                field.value = food[name];
+            }
+        });
+    }
+
+    function search(query) {
+        if (pending) {
+            pending.abort();
+        }
+        pending = new AbortController();
+        const url = input.dataset.foodSearchUrl + '?q=' + encodeURIComponent(query);
+        fetch(url, { headers: { 'Accept': 'application/json' }, signal: pending.signal })
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error('Food search failed: ' + response.status);
+                }
+                return response.json();
+            })
+            .then(function(foods) {
+                suggestions = {};
+                list.replaceChildren();
+                foods.forEach(function(food) {
+                    suggestions[food.food_name.toLowerCase()] = food;
+                    const option = document.createElement('option');
+                    option.value = food.food_name;
+                    option.label = food.calories + ' kcal';
+                    list.appendChild(option);
+                });
+            })
+            .catch(function(error) {
+                if (error.name !== 'AbortError') {
+                    console.error(error);
+                }
+            });
+    }
+
+    input.addEventListener('input', function() {
+        const query = input.value.trim();
+        const match = suggestions[query.toLowerCase()];
+        if (match) {
+            fill(match);
+            return;
+        }
+        clearTimeout(timer);
+        if (query) {
+            timer = setTimeout(function() { search(query); }, 150);
+        }
+    });
+})();
@@ -0,0 +1,31 @@
+// "Load more" buttons: fetch the HTML fragment at data-url, append it to the
+// element named by data-target, and point the button at the next page from the
+// X-Next-Page header (or remove it once there is nothing left to load).
+document.addEventListener('click', function(event) {
+    const button = event.target.closest('[data-load-more]');
+    if (!button || button.disabled) {
+        return;
+    }
+    button.disabled = true;
+
+    fetch(button.dataset.url, { headers: { 'Accept': 'text/html' } })
+        .then(function(response) {
+            if (!response.ok) {
+                throw new Error('Failed to load more rows: ' + response.status);
+            }
+            const nextUrl = response.headers.get('X-Next-Page');
+            return response.text().then(function(html) {
+                document.getElementById(button.dataset.target).insertAdjacentHTML('beforeend', html);
+                if (nextUrl) {
+                    button.dataset.url = nextUrl;
+                    button.disabled = false;
+                } else {
+                    button.remove();
+                }
+            });
+        })
+        .catch(function(error) {
+            console.error(error);
+            button.disabled = false;
+        });
+});
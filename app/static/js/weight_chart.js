@@ -9,13 +9,14 @@ function toggleEdit(entryId) {
     editForm.classList.toggle('hidden');
 }
 
-function initializeChart(chartWeights, chartDates, chartGoalLine) {
-    console.log('Initializing chart with:', { chartWeights, chartDates, chartGoalLine });
+function initializeChart(chartWeights, chartDates, chartGoalLine, chartTrend) {
+    console.log('Initializing chart with:', { chartWeights, chartDates, chartGoalLine, chartTrend });
     
     // Ensure we have arrays
     chartWeights = Array.isArray(chartWeights) ? chartWeights : [];
     chartDates = Array.isArray(chartDates) ? chartDates : [];
     chartGoalLine = Array.isArray(chartGoalLine) ? chartGoalLine : [];
+    chartTrend = Array.isArray(chartTrend) ? chartTrend : [];
     
     const isDarkMode = document.documentElement.classList.contains('dark');
     const canvas = document.getElementById('weightChart');
@@ -38,29 +39,16 @@ function initializeChart(chartWeights, chartDates, chartGoalLine) {
         return null;
     }
     
-    // Ensure all arrays have the same length
-    const maxLength = Math.max(chartWeights.length, chartDates.length, chartGoalLine.length);
-    
-    // Pad arrays if needed
-    if (chartDates.length < maxLength) {
-        // Generate placeholder dates if needed
-        for (let i = chartDates.length; i < maxLength; i++) {
-            chartDates.push(`Date ${i+1}`);
+    // Plot points by timestamp so that gaps between entries and the goal
+    // line's two endpoints are spaced correctly on the x axis
+    const weightPoints = [];
+    for (let i = 0; i < Math.min(chartWeights.length, chartDates.length); i++) {
+        if (chartWeights[i] !== null && chartWeights[i] !== undefined) {
+            weightPoints.push({ x: Date.parse(chartDates[i]), y: chartWeights[i] });
         }
     }
     
-    if (chartWeights.length < maxLength) {
-        chartWeights = chartWeights.concat(Array(maxLength - chartWeights.length).fill(null));
-    }
-    
-    if (chartGoalLine.length < maxLength) {
-        chartGoalLine = chartGoalLine.concat(Array(maxLength - chartGoalLine.length).fill(null));
-    }
-    
-    // Filter out any null or undefined values for display check
-    const filteredData = chartWeights.filter(weight => weight !== null && weight !== undefined);
-    
-    if (filteredData.length === 0) {
+    if (weightPoints.length === 0) {
         ctx.clearRect(0, 0, canvas.width, canvas.height);
         ctx.font = '16px Arial';
         ctx.fillStyle = isDarkMode ? '#D1D5DB' : '#374151';
@@ -72,7 +60,7 @@ function initializeChart(chartWeights, chartDates, chartGoalLine) {
     
     const datasets = [{
         label: 'Weight (kg)',
-        data: chartWeights,
+        data: weightPoints,
         borderColor: '#9333EA',
         backgroundColor: '#9333EA20',
         fill: true,
@@ -80,10 +68,36 @@ function initializeChart(chartWeights, chartDates, chartGoalLine) {
         spanGaps: true
     }];
 
-    if (chartGoalLine.length > 0 && chartGoalLine.some(value => value !== null && value !== undefined)) {
+    // Smoothed trend, one value per plotted weight
+    const trendPoints = [];
+    for (let i = 0; i < Math.min(chartTrend.length, chartDates.length); i++) {
+        if (chartTrend[i] !== null && chartTrend[i] !== undefined) {
+            trendPoints.push({ x: Date.parse(chartDates[i]), y: chartTrend[i] });
+        }
+    }
+
+    if (trendPoints.length > 0) {
+        datasets.push({
+            label: 'Trend',
+            data: trendPoints,
+            borderColor: '#F59E0B',
+            backgroundColor: 'transparent',
+            borderWidth: 2,
+            pointRadius: 0,
+            fill: false,
+            tension: 0.3,
+            spanGaps: true
+        });
+    }
+
+    const goalPoints = chartGoalLine
+        .filter(point => point && point.weight !== null && point.weight !== undefined)
+        .map(point => ({ x: Date.parse(point.date), y: point.weight }));
+
+    if (goalPoints.length > 0) {
         datasets.push({
             label: 'Weight Goal',
-            data: chartGoalLine,
+            data: goalPoints,
             borderColor: '#10B981',
             backgroundColor: 'transparent',
             borderDash: [5, 5],
@@ -96,7 +110,6 @@ function initializeChart(chartWeights, chartDates, chartGoalLine) {
     const chartConfig = {
         type: 'line',
         data: {
-            labels: chartDates,
             datasets: datasets
         },
         options: {
@@ -116,6 +129,7 @@ function initializeChart(chartWeights, chartDates, chartGoalLine) {
                     }
                 },
                 x: {
+                    type: 'linear',
                     grid: {
                         color: isDarkMode ? 'rgba(255, 255, 255, 0.1)' : 'rgba(0, 0, 0, 0.1)'
                     },
@@ -125,7 +139,14 @@ function initializeChart(chartWeights, chartDates, chartGoalLine) {
                             size: 12
                         },
                         maxRotation: 45,
-                        minRotation: 45
+                        minRotation: 45,
+                        callback: function(value) {
+                            return new Date(value).toLocaleDateString('en-US', {
+                                year: 'numeric',
+                                month: 'short',
+                                day: 'numeric'
+                            });
+                        }
                     }
                 }
             },
@@ -141,11 +162,21 @@ function initializeChart(chartWeights, chartDates, chartGoalLine) {
                 },
                 tooltip: {
                     callbacks: {
+                        title: function(tooltipItems) {
+                            return new Date(tooltipItems[0].parsed.x).toLocaleDateString('en-US', {
+                                year: 'numeric',
+                                month: 'long',
+                                day: 'numeric'
+                            });
+                        },
                         label: function(context) {
                             if (context.dataset.label === 'Weight Goal') {
-                                return `Goal: ${context.raw !== null && context.raw !== undefined ? parseFloat(context.raw).toFixed(1) : 'N/A'} kg`;
+                                return `Goal: ${context.raw !== null && context.raw !== undefined ? parseFloat(context.parsed.y).toFixed(1) : 'N/A'} kg`;
+                            }
+                            if (context.dataset.label === 'Trend') {
+                                return `Trend: ${parseFloat(context.parsed.y).toFixed(1)} kg`;
                             }
-                            return `Weight: ${context.raw !== null && context.raw !== undefined ? parseFloat(context.raw) : 'N/A'} kg`;
+                            return `Weight: ${context.raw !== null && context.raw !== undefined ? parseFloat(context.parsed.y) : 'N/A'} kg`;
                         }
                     }
                 }
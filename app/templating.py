@@ -0,0 +1,69 @@
+import os
+import time
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from jinja2 import FileSystemBytecodeCache
+
+class _SafeBytecodeCache(FileSystemBytecodeCache):
+    """A FileSystemBytecodeCache whose failed writes only log, so rendering never fails on them."""
+
+    def __init__(self, directory, logger):
+        super().__init__(directory)
+        self.logger = logger
+        self.warned = False
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            if not self.warned:
+                self.logger.warning('Could not write to the template cache in %s: %s', self.directory, e)
+                self.warned = True
+
+class TemplateBytecodeCache:
+    """Persistent Jinja bytecode cache shared by every worker process.
+
+    Compiled templates are stored in TEMPLATE_CACHE_DIR under a checksum of
+    their source, so a new or recycled worker loads them instead of
+    compiling each template on its first request, and an edited template is
+    simply compiled again. The cache is opt-in: nothing changes if
+    TEMPLATE_CACHE_DIR is unset, and an unwritable directory only logs a
+    warning, as does a failed write while rendering.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        directory = app.config.get('TEMPLATE_CACHE_DIR')
+        if not directory:
+            return
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            app.logger.warning('Template cache disabled, cannot create %s: %s', directory, e)
+            return
+        if not os.access(directory, os.W_OK | os.X_OK):
+            app.logger.warning('Template cache disabled, %s is not writable', directory)
+            return
+        app.jinja_env.bytecode_cache = _SafeBytecodeCache(directory, app.logger)
+
+@click.group('templates')
+def templates_cli():
+    """Template cache tools."""
+
+@templates_cli.command('compile')
+@with_appcontext
+def compile_command():
+    """Compile every template into the bytecode cache, e.g. at deploy time."""
+    env = current_app.jinja_env
+    if env.bytecode_cache is None:
+        raise click.ClickException('TEMPLATE_CACHE_DIR is not set or not writable.')
+    started = time.perf_counter()
+    names = env.list_templates()
+    for name in names:
+        env.get_template(name)
+    click.echo(f'Compiled {len(names)} templates into {current_app.config["TEMPLATE_CACHE_DIR"]} '
+               f'in {time.perf_counter() - started:.2f}s.')
@@ -2,4 +2,4 @@ from flask import Blueprint
 
 bp = Blueprint('weight', __name__)
 
-from app.weight import routes 
\ No newline at end of file
+from app.weight import routes, commands 
\ No newline at end of file
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from app.weight.progress import goal_weight_at
+from app.weight.trend import get_trend
+
+# Selectable chart windows in days; None means the full history
+CHART_RANGES = {
+    '30d': 30,
+    '90d': 90,
+    '1y': 365,
+    'all': None
+}
+# The tracker shows the full history unless another range is picked; the dashboard
+# always requests '30d', so the two only share a cached response at that range
+DEFAULT_CHART_RANGE = 'all'
+
+def lttb_indices(xs, ys, threshold):
+    """Pick the indices of the points to keep with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. In each bucket in between the
+    point forming the largest triangle with the previously kept point and the
+    average of the next bucket is kept, which preserves peaks and troughs.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    indices = [0]
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average point of the next bucket
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_len = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / avg_len
+        avg_y = sum(ys[avg_start:avg_end]) / avg_len
+
+        # Point of the current bucket with the largest triangle area
+        range_start = int(i * every) + 1
+        range_end = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        max_area = -1
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                next_a = j
+
+        indices.append(next_a)
+        a = next_a
+
+    indices.append(n - 1)
+    return indices
+
+def goal_line_endpoints(goal, window_start=None):
+    """Return the goal line as its two endpoints, clipped to the chart window."""
+    start_date = goal.start_date
+    start_weight = goal.start_weight
+    if window_start and window_start > start_date:
+        start_date = min(window_start, goal.target_date)
+        start_weight = goal_weight_at(goal, start_date)
+
+    return [
+        {'date': start_date.strftime('%Y-%m-%dT%H:%M:%S'), 'weight': float(start_weight)},
+        {'date': goal.target_date.strftime('%Y-%m-%dT%H:%M:%S'), 'weight': float(goal.target_weight)}
+    ]
+
+def build_chart_data(user_id, active_goal, range_key, max_points):
+    """Build the downsampled weight series, its trend and the goal line for the tracker chart."""
+    days = CHART_RANGES.get(range_key)
+    window_start = datetime.utcnow() - timedelta(days=days) if days else None
+
+    # The cached trend already holds the whole series in date order
+    trend = get_trend(user_id)
+    end = len(trend)
+    start = trend.index_from(window_start) if window_start else 0
+    xs = trend.times[start:end]
+    ys = trend.weights[start:end]
+    keep = [start + i for i in lttb_indices(xs, ys, max_points)]
+
+    return {
+        'dates': [trend.dates[i].strftime('%Y-%m-%dT%H:%M:%S') for i in keep],
+        'weights': [trend.weights[i] for i in keep],
+        'trend': [round(trend.trend[i], 2) for i in keep],
+        'goal_line': goal_line_endpoints(active_goal, window_start) if active_goal and xs else []
+    }
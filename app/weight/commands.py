@@ -0,0 +1,19 @@
+import click
+from app.extensions import db
+from app.weight import bp
+from app.weight.forecast import recompute_forecast
+from app.models import WeightEntry
+
+@bp.cli.command('rebuild-forecast')
+@click.option('--user-id', type=int, help='Only rebuild the forecast of this user.')
+def rebuild_forecast_command(user_id):
+    """Recompute the goal-forecast regression sums from the weight entries."""
+    if user_id is not None:
+        user_ids = [user_id]
+    else:
+        user_ids = [row[0] for row in db.session.query(WeightEntry.user_id).distinct()]
+
+    for uid in user_ids:
+        recompute_forecast(uid)
+    db.session.commit()
+    click.echo(f'Rebuilt weight forecasts for {len(user_ids)} user(s).')
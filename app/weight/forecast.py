@@ -0,0 +1,137 @@
+import math
+from datetime import datetime, timedelta
+from flask import current_app
+from app.extensions import db
+from app.models import WeightEntry, WeightForecast
+from app.weight.progress import SECONDS_PER_DAY
+
+def _days(state, date):
+    return (date - state.origin).total_seconds() / SECONDS_PER_DAY
+
+def _count(state, date, weight, sign=1):
+    """Add (or with sign=-1, remove) one entry to the running sums."""
+    t = _days(state, date)
+    state.count += sign
+    state.sum_t += sign * t
+    state.sum_w += sign * weight
+    state.sum_tw += sign * t * weight
+    state.sum_tt += sign * t * t
+    state.sum_ww += sign * weight * weight
+
+def _window():
+    return timedelta(days=current_app.config['WEIGHT_FORECAST_WINDOW_DAYS'])
+
+def recompute_forecast(user_id):
+    """Rebuild a user's forecast sums from the entries in the window ending at their latest entry."""
+    state = db.session.get(WeightForecast, user_id) or WeightForecast(user_id=user_id)
+    latest = db.session.query(db.func.max(WeightEntry.date)).filter(WeightEntry.user_id == user_id).scalar()
+    start = (latest or datetime.utcnow()) - _window()
+    state.origin = state.window_start = start
+    state.last_date = latest
+    state.count = 0
+    state.sum_t = state.sum_w = state.sum_tw = state.sum_tt = state.sum_ww = 0.0
+
+    entries = db.session.query(WeightEntry.date, WeightEntry.weight).filter(
+        WeightEntry.user_id == user_id,
+        WeightEntry.date >= start
+    )
+    for date, weight in entries:
+        _count(state, date, weight)
+
+    db.session.add(state)
+    return state
+
+def record_added_entry(entry):
+    """Count a new entry in O(1), sliding the window forward past entries that fall out of it.
+
+    Each entry is read back once when it leaves the window, so the cost per
+    entry stays constant however long the history grows.
+    """
+    if entry.date is None:
+        db.session.flush()  # Fills in the date column default
+    state = db.session.get(WeightForecast, entry.user_id)
+    if state is None or (state.last_date and entry.date < state.last_date):
+        # No state yet, or the entry is older than the latest one counted
+        return recompute_forecast(entry.user_id)
+
+    window_start = entry.date - _window()
+    if window_start > state.window_start:
+        leaving = db.session.query(WeightEntry.date, WeightEntry.weight).filter(
+            WeightEntry.user_id == entry.user_id,
+            WeightEntry.date >= state.window_start,
+            WeightEntry.date < window_start
+        )
+        for date, weight in leaving:
+            _count(state, date, weight, sign=-1)
+        state.window_start = window_start
+
+    _count(state, entry.date, entry.weight)
+    state.last_date = entry.date
+    return state
+
+def record_edited_entry(entry, old_weight):
+    """Swap an edited entry's old weight for its new one in O(1)."""
+    state = db.session.get(WeightForecast, entry.user_id)
+    if state is None:
+        return recompute_forecast(entry.user_id)
+    if entry.date >= state.window_start:
+        _count(state, entry.date, old_weight, sign=-1)
+        _count(state, entry.date, entry.weight)
+    return state
+
+def record_deleted_entry(entry):
+    """Drop a deleted entry from the sums in O(1).
+
+    Deleting the latest entry moves the window back to end at the one
+    before it, so that case is rebuilt instead.
+    """
+    state = db.session.get(WeightForecast, entry.user_id)
+    if state is None or (state.last_date and entry.date >= state.last_date):
+        return recompute_forecast(entry.user_id)
+    if entry.date >= state.window_start:
+        _count(state, entry.date, entry.weight, sign=-1)
+    return state
+
+def project_goal(state, goal):
+    """Project when the recent weight trend reaches the goal's target weight.
+
+    Fits a least-squares line to the window's entries and extends it from
+    the latest entry. The band comes from the slope's confidence interval;
+    `latest` is None when the slow end of it never reaches the target.
+    Returns None while there are too few entries or the trend is heading
+    away from the target.
+    """
+    n = state.count if state else 0
+    if goal is None or n < max(current_app.config['WEIGHT_FORECAST_MIN_ENTRIES'], 3):
+        return None
+    sxx = state.sum_tt - state.sum_t * state.sum_t / n
+    if sxx <= 1e-9:
+        return None
+    slope = (state.sum_tw - state.sum_t * state.sum_w / n) / sxx
+    intercept = (state.sum_w - slope * state.sum_t) / n
+    residuals = max(state.sum_ww - intercept * state.sum_w - slope * state.sum_tw, 0)
+    margin = current_app.config['WEIGHT_FORECAST_CONFIDENCE_Z'] * math.sqrt(residuals / (n - 2) / sxx)
+
+    fitted = intercept + slope * _days(state, state.last_date)
+    remaining = goal.target_weight - fitted
+
+    def reached_after(rate):
+        # Days from the latest entry until the line at `rate` kg/day reaches the target
+        days = remaining / rate if rate else None
+        return state.last_date + timedelta(days=days) if days is not None and 0 <= days < 36500 else None
+
+    projected = reached_after(slope)
+    if projected is None:
+        return None
+    towards = math.copysign(1, remaining)
+    return {
+        'date': projected,
+        'earliest': reached_after(slope + towards * margin),
+        'latest': reached_after(slope - towards * margin),
+        'weekly_rate': slope * 7,
+        'on_track': projected <= goal.target_date
+    }
+
+def goal_forecast(user_id, goal):
+    """Forecast for the user's goal from the stored sums, without reading any entries."""
+    return project_goal(db.session.get(WeightForecast, user_id), goal)
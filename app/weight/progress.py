@@ -0,0 +1,55 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+
+# Series are parallel lists of ascending timestamps (seconds) and values; windows
+# are found by binary search, so each lookup is O(log n) in the history length
+
+def timestamp(date):
+    # Dates are naive UTC, so measure from a naive epoch rather than the local-time .timestamp()
+    return (date - EPOCH).total_seconds()
+
+def first_index_from(times, t):
+    """Index of the first point at or after `t` (len(times) if there is none)."""
+    return bisect_left(times, t)
+
+def last_index_at(times, t):
+    """Index of the last point at or before `t`, or of the first point if all are later."""
+    return max(bisect_right(times, t) - 1, 0)
+
+def window_change(times, values, days):
+    """Change in `values` over the last `days` days up to the latest point.
+
+    The window starts at the last point at or before latest - days, or at
+    the first point of a shorter history.
+    """
+    if len(times) < 2:
+        return 0
+    start = last_index_at(times, times[-1] - days * SECONDS_PER_DAY)
+    return values[-1] - values[start]
+
+def window_rate(times, values, days, per_days=7):
+    """Average rate of change over the last `days` days, per `per_days` days."""
+    if len(times) < 2:
+        return 0
+    start = last_index_at(times, times[-1] - days * SECONDS_PER_DAY)
+    elapsed = (times[-1] - times[start]) / SECONDS_PER_DAY
+    return (values[-1] - values[start]) / elapsed * per_days if elapsed > 0 else 0
+
+def goal_projection(start, start_weight, target, target_weight, t):
+    """Weight the straight goal line from (start, start_weight) to (target, target_weight) expects at `t`.
+
+    Before the start the line holds its start weight and after the target
+    its target weight.
+    """
+    if t <= start:
+        return start_weight
+    if t >= target:
+        return target_weight
+    return start_weight + (target_weight - start_weight) * (t - start) / (target - start)
+
+def goal_weight_at(goal, date):
+    return goal_projection(timestamp(goal.start_date), goal.start_weight,
+                           timestamp(goal.target_date), goal.target_weight, timestamp(date))
@@ -1,10 +1,23 @@
-from flask import render_template, flash, redirect, url_for, jsonify, request
+from flask import render_template, flash, redirect, url_for, jsonify, request, current_app
 from flask_login import login_required, current_user
 from app.extensions import db
 from app.weight import bp
 from app.weight.forms import WeightEntryForm, WeightGoalForm
-from app.models import WeightEntry, WeightGoal, FastingSession
-from datetime import datetime, timedelta
+from app.weight.charts import build_chart_data, CHART_RANGES, DEFAULT_CHART_RANGE
+from app.weight.progress import goal_weight_at
+from app.weight.trend import get_trend, append_to_trend
+from app.weight.forecast import goal_forecast, record_added_entry, record_edited_entry, record_deleted_entry
+from app.pagination import date_keyset_page, fragment_response
+from app.models import WeightEntry, WeightGoal, FastingSession, bump_data_version, get_data_version
+from app.replica import replica_reads
+from datetime import datetime
+from sqlalchemy import func
+
+@replica_reads()
+def weight_history_page(user_id, cursor):
+    query = WeightEntry.query.filter_by(user_id=user_id)
+    return date_keyset_page(query, WeightEntry.date, WeightEntry.id, cursor,
+                            current_app.config['HISTORY_PAGE_SIZE'])
 
 @bp.route('/tracker', methods=['GET', 'POST'])
 @login_required
@@ -19,8 +32,9 @@ def tracker():
     ).order_by(FastingSession.start_time.desc()).first()
 
     if form.validate_on_submit():
-        entry = WeightEntry(weight=form.weight.data, user=current_user)
+        entry = WeightEntry(weight=form.weight.data, user_id=current_user.id)
         db.session.add(entry)
+        record_added_entry(entry)
         
         # Check if the user has reached their weight goal
         active_goal = WeightGoal.query.filter_by(user_id=current_user.id, active=True).first()
@@ -36,163 +50,112 @@ def tracker():
                 active_goal.completed = True
                 # Keep the goal active so it still shows in the UI, but mark it as completed
         
+        bump_data_version(current_user.id, weights=True)
         db.session.commit()
+        append_to_trend(current_user.id, entry)
         flash('Weight entry added successfully!', 'success')
         return redirect(url_for('weight.tracker'))
 
-    # Get weight statistics
-    weight_entries = WeightEntry.query.filter_by(user_id=current_user.id).order_by(WeightEntry.date.desc()).all()
-    starting_weight = weight_entries[-1].weight if weight_entries else None
-    current_weight = weight_entries[0].weight if weight_entries else None
+    # Only the first page of history is rendered; older rows come from weight.history_rows
+    history = weight_history_page(current_user.id, None)
+    latest_entry = history.items[0] if history.items else None
+    trend = get_trend(current_user.id)
+    starting_weight = trend.weights[0] if len(trend) else None
+    current_weight = latest_entry.weight if latest_entry else None
     total_loss = current_weight - starting_weight if current_weight and starting_weight else None
 
     # Get active weight goal
     active_goal = WeightGoal.query.filter_by(user_id=current_user.id, active=True).first()
 
-    # Calculate progress based on meeting daily/weekly/monthly goals
+    # Progress against the daily/weekly/monthly goals is measured on the smoothed
+    # trend, so a single noisy weigh-in does not swing it
     recent_progress = {
         'daily': 0,
         'weekly': 0,
         'monthly': 0
     }
-    
-    if weight_entries and len(weight_entries) >= 2 and active_goal:
-        # For daily progress, use the most recent weight change
-        latest_two = weight_entries[:2]
-        daily_change = latest_two[0].weight - latest_two[1].weight  # Negative means weight loss
-        recent_progress['daily'] = daily_change
-        
-        # For weekly progress, use the most recent week's worth of changes
-        weekly_change = 0
-        for i in range(len(weight_entries) - 1):
-            current_entry = weight_entries[i]
-            next_entry = weight_entries[i + 1]
-            days_between = (current_entry.date - next_entry.date).days
-            if days_between <= 7:  # Only include changes within the last 7 days
-                change = current_entry.weight - next_entry.weight
-                weekly_change += change
-            else:
-                break
-        recent_progress['weekly'] = weekly_change
-        
-        # For monthly progress, use the most recent month's worth of changes
-        monthly_change = 0
-        for i in range(len(weight_entries) - 1):
-            current_entry = weight_entries[i]
-            next_entry = weight_entries[i + 1]
-            days_between = (current_entry.date - next_entry.date).days
-            if days_between <= 30:  # Only include changes within the last 30 days
-                change = current_entry.weight - next_entry.weight
-                monthly_change += change
-            else:
-                break
-        recent_progress['monthly'] = monthly_change
+    if len(trend) >= 2 and active_goal:
+        recent_progress['daily'] = trend.change(1)  # Negative means weight loss
+        recent_progress['weekly'] = trend.change(7)
+        recent_progress['monthly'] = trend.change(30)
 
-    # Initialize empty arrays for chart data
-    dates = []
-    weights = []
-    goal_line = []
-    
-    # Prepare data for the chart
-    if weight_entries:
-        if active_goal:
-            goal_start_date = active_goal.start_date.date()
-            actual_start_weight = active_goal.start_weight  # Use the weight saved when goal was created
-            
-            for entry in reversed(weight_entries):
-                dates.append(entry.date.strftime('%Y-%m-%d'))
-                weights.append(float(entry.weight))  # Ensure weight is a float
-                days_from_start = (entry.date.date() - goal_start_date).days
-                if days_from_start >= 0:  # Only calculate goal for dates after goal start
-                    total_days = (active_goal.target_date.date() - goal_start_date).days
-                    if total_days > 0:
-                        daily_change = (active_goal.target_weight - actual_start_weight) / total_days
-                        goal_weight = actual_start_weight + (daily_change * days_from_start)
-                        goal_line.append(float(goal_weight))  # Ensure goal weight is a float
-                    else:
-                        goal_line.append(float(actual_start_weight))  # Ensure start weight is a float
-                else:
-                    # For dates before goal start, don't show any goal line
-                    goal_line.append(None)
+    # How far the trend is ahead of (positive) or behind the goal line at the latest entry
+    ahead_of_plan = None
+    if len(trend) and active_goal:
+        expected = goal_weight_at(active_goal, trend.dates[-1])
+        losing = active_goal.target_weight < active_goal.start_weight
+        ahead_of_plan = expected - trend.latest if losing else trend.latest - expected
 
-            # If there's an active goal, extend the goal line to the target date
-            if dates:
-                last_date = datetime.strptime(dates[-1], '%Y-%m-%d')
-                target_date = active_goal.target_date.date()
-                
-                # Calculate how many days to add
-                days_to_add = (target_date - last_date.date()).days
-                
-                # Add future dates and corresponding goal values
-                for i in range(1, days_to_add + 1):
-                    future_date = last_date + timedelta(days=i)
-                    dates.append(future_date.strftime('%Y-%m-%d'))
-                    
-                    days_from_start = (future_date.date() - goal_start_date).days
-                    total_days = (target_date - goal_start_date).days
-                    
-                    if total_days > 0:
-                        daily_change = (active_goal.target_weight - actual_start_weight) / total_days
-                        goal_weight = actual_start_weight + (daily_change * days_from_start)
-                    else:
-                        goal_weight = actual_start_weight
-                        
-                    weights.append(None)  # Add None for actual weights on future dates
-                    goal_line.append(float(goal_weight))  # Ensure goal weight is a float
-        else:
-            # If no active goal, just add the weight entries to the chart
-            for entry in reversed(weight_entries):
-                dates.append(entry.date.strftime('%Y-%m-%d'))
-                weights.append(float(entry.weight))  # Ensure weight is a float
-    
-    # Ensure we have at least empty arrays if no data
-    if not dates:
-        dates = []
-    if not weights:
-        weights = []
-    if not goal_line:
-        goal_line = []
-        
-    # Ensure all arrays have the same length
-    max_length = max(len(dates), len(weights), len(goal_line))
-    
-    # Pad arrays to ensure they all have the same length
-    if len(dates) < max_length:
-        # If dates array is shorter, add placeholder dates
-        for i in range(len(dates), max_length):
-            if i > 0 and i-1 < len(dates):
-                # Try to extrapolate from the last date
-                last_date = datetime.strptime(dates[i-1], '%Y-%m-%d')
-                dates.append((last_date + timedelta(days=1)).strftime('%Y-%m-%d'))
-            else:
-                # Fallback to today's date + index
-                dates.append((datetime.now() + timedelta(days=i)).strftime('%Y-%m-%d'))
-    
-    if len(weights) < max_length:
-        # Pad weights array with null values
-        weights.extend([None] * (max_length - len(weights)))
-    
-    if len(goal_line) < max_length:
-        # Pad goal_line array with null values
-        goal_line.extend([None] * (max_length - len(goal_line)))
-    
-    # Debug output
-    print(f"Dates length: {len(dates)}, Weights length: {len(weights)}, Goal line length: {len(goal_line)}")
+    # Projected goal date from the stored regression sums
+    forecast = goal_forecast(current_user.id, active_goal) if active_goal and not active_goal.completed else None
+
+    # The chart itself is loaded from weight.chart_data
+    chart_range = request.args.get('range', DEFAULT_CHART_RANGE)
+    if chart_range not in CHART_RANGES:
+        chart_range = DEFAULT_CHART_RANGE
 
     return render_template('weight_tracker.html',
                          form=form,
                          goal_form=goal_form,
-                         weight_entries=weight_entries,
+                         history=history,
                          starting_weight=starting_weight,
                          current_weight=current_weight,
                          total_loss=total_loss,
-                         dates=dates,
-                         weights=weights,
-                         goal_line=goal_line if active_goal and goal_line else [],
+                         chart_range=chart_range,
+                         chart_ranges=CHART_RANGES,
                          active_goal=active_goal,
                          recent_progress=recent_progress,
+                         trend_weight=trend.latest,
+                         weekly_rate=trend.weekly_rate(),
+                         ahead_of_plan=ahead_of_plan,
+                         forecast=forecast,
                          current_fast=current_fast)
 
+@bp.route('/history')
+@login_required
+def history_rows():
+    """Next page of the weight history as an HTML fragment for "Load more"."""
+    history = weight_history_page(current_user.id, request.args.get('cursor'))
+    current_fast = FastingSession.query.filter_by(
+        user_id=current_user.id,
+        completed=False
+    ).order_by(FastingSession.start_time.desc()).first()
+    html = render_template('weight/_history_rows.html',
+                           entries=history.items,
+                           following=history.following,
+                           current_fast=current_fast)
+    next_url = url_for('weight.history_rows', cursor=history.next_cursor) if history.has_more else None
+    return fragment_response(html, next_url)
+
+@bp.route('/chart-data')
+@login_required
+def chart_data():
+    chart_range = request.args.get('range', DEFAULT_CHART_RANGE)
+    if chart_range not in CHART_RANGES:
+        chart_range = DEFAULT_CHART_RANGE
+    max_points = current_app.config['WEIGHT_CHART_MAX_POINTS']
+
+    # The data only changes when the user writes or when the range window moves
+    # to a new day, so the latest entry id, the data version and today's date
+    # identify it without building it
+    latest_entry_id = db.session.query(func.max(WeightEntry.id))\
+        .filter(WeightEntry.user_id == current_user.id).scalar()
+    data_version = get_data_version(current_user.id)
+    etag = '{}-{}-{}-{}-{}-{}'.format(current_user.id, latest_entry_id or 0, data_version,
+                                      chart_range, max_points, datetime.utcnow().strftime('%Y%m%d'))
+
+    # Weak comparison, since compression turns the ETag into a weak one
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        active_goal = WeightGoal.query.filter_by(user_id=current_user.id, active=True).first()
+        response = jsonify(build_chart_data(current_user.id, active_goal, chart_range, max_points))
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Cookie')
+    return response
+
 @bp.route('/set_goal', methods=['POST'])
 @login_required
 def set_goal():
@@ -217,7 +180,7 @@ def set_goal():
             start_date=current_time,
             target_date=datetime.combine(form.target_date.data, datetime.min.time()),
             goal_type=form.goal_type.data,
-            user=current_user,
+            user_id=current_user.id,
             active=True
         )
         
@@ -242,6 +205,7 @@ def set_goal():
             flash(message, 'info')
         
         db.session.add(goal)
+        bump_data_version(current_user.id)
         db.session.commit()
         flash('Weight goal set successfully!', 'success')
     return redirect(url_for('weight.tracker'))
@@ -252,6 +216,7 @@ def cancel_goal():
     active_goal = WeightGoal.query.filter_by(user_id=current_user.id, active=True).first()
     if active_goal:
         active_goal.active = False
+        bump_data_version(current_user.id)
         db.session.commit()
         flash('Weight goal cancelled successfully!', 'success')
     return redirect(url_for('weight.tracker'))
@@ -265,6 +230,8 @@ def delete_entry(entry_id):
         return redirect(url_for('weight.tracker'))
     
     db.session.delete(entry)
+    record_deleted_entry(entry)
+    bump_data_version(current_user.id, weights=True)
     db.session.commit()
     flash('Weight entry deleted successfully!', 'success')
     return redirect(url_for('weight.tracker'))
@@ -283,7 +250,10 @@ def edit_entry(entry_id):
         if new_weight < 20 or new_weight > 500:
             raise ValueError("Weight must be between 20 and 500 kg")
         
+        old_weight = entry.weight
         entry.weight = new_weight
+        record_edited_entry(entry, old_weight)
+        bump_data_version(current_user.id, weights=True)
         db.session.commit()
         flash('Weight entry updated successfully!', 'success')
     except ValueError as e:
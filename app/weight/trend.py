@@ -0,0 +1,106 @@
+import threading
+from flask import current_app
+from app.cache import app_cache
+from app.extensions import db
+from app.models import WeightEntry, get_weight_version
+from app.weight.progress import SECONDS_PER_DAY, timestamp, first_index_from, window_change, window_rate
+
+_append_lock = threading.Lock()
+
+class WeightTrend:
+    """A user's weight series in date order with its exponentially smoothed trend.
+
+    Each entry moves the trend `smoothing` of the way to its weight for every
+    day since the previous entry (entries less than a day apart count as one
+    day), so gaps in the log are caught up on and daily noise is damped.
+    Appending an entry only needs the previous trend value.
+    """
+
+    def __init__(self, smoothing, version=None):
+        self.smoothing = smoothing
+        self.version = version
+        self.dates = []
+        self.times = []
+        self.weights = []
+        self.trend = []
+
+    def append(self, date, weight):
+        t = timestamp(date)
+        if self.trend:
+            days = max((t - self.times[-1]) / SECONDS_PER_DAY, 1)
+            previous = self.trend[-1]
+            value = previous + (1 - (1 - self.smoothing) ** days) * (weight - previous)
+        else:
+            value = weight
+        # times last: readers bisect it, so it never runs ahead of the other lists
+        self.trend.append(value)
+        self.weights.append(weight)
+        self.dates.append(date)
+        self.times.append(t)
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def latest(self):
+        return self.trend[-1] if self.trend else None
+
+    def index_from(self, date):
+        """Index of the first entry at or after `date`."""
+        return first_index_from(self.times, timestamp(date))
+
+    def change(self, days):
+        """Trend change over the last `days` days up to the latest entry; negative means loss."""
+        return window_change(self.times, self.trend, days)
+
+    def weekly_rate(self):
+        """Rate of change of the trend in kg/week, measured over the last week (or all of a shorter history)."""
+        return window_rate(self.times, self.trend, 7)
+
+def trend_cache():
+    """Per-app LRU cache of WeightTrend series, keyed by user."""
+    return app_cache('weight_trend_cache', 'WEIGHT_TREND_CACHE_SIZE', 'WEIGHT_TREND_CACHE_TTL')
+
+def build_trend(user_id, version=None):
+    """Compute a user's trend from their full weight history in one pass."""
+    trend = WeightTrend(current_app.config['WEIGHT_TREND_SMOOTHING'], version)
+    rows = db.session.execute(
+        db.select(WeightEntry.date, WeightEntry.weight)
+        .where(WeightEntry.user_id == user_id)
+        .order_by(WeightEntry.date, WeightEntry.id)
+        .execution_options(yield_per=1000)
+    )
+    for date, weight in rows:
+        trend.append(date, float(weight))
+    return trend
+
+def get_trend(user_id):
+    """The user's WeightTrend, rebuilt only when their weight version has moved on.
+
+    Keyed on the weight version rather than the data version, so logging food
+    or changing a goal leaves the cached series in place.
+    """
+    cache = trend_cache()
+    version = get_weight_version(user_id)
+    trend = cache.get(user_id)
+    if trend is None or trend.version != version:
+        trend = build_trend(user_id, version)
+        cache.set(user_id, trend)
+    return trend
+
+def append_to_trend(user_id, entry):
+    """Extend the cached trend with a newly committed entry instead of rebuilding it.
+
+    Only applies when the cache holds the series from just before this write
+    and the entry is the newest one; anything else is left to get_trend,
+    which rebuilds on the version mismatch.
+    """
+    version = get_weight_version(user_id)
+    with _append_lock:
+        trend = trend_cache().get(user_id)
+        if trend is None or trend.version != version - 1:
+            return
+        if trend.times and timestamp(entry.date) < trend.times[-1]:
+            return
+        trend.append(entry.date, float(entry.weight))
+        trend.version = version
@@ -0,0 +1,6 @@
+"""Benchmarks for the Weight Tracker application.
+
+Run a benchmark module from the project root, for example::
+
+    python -m benchmarks.routes --sizes 10:1,10:3 --output bench.json
+"""
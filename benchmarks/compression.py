@@ -0,0 +1,120 @@
+"""CPU cost against bytes saved for compressing typical tracker pages.
+
+Usage::
+
+    python -m benchmarks.compression --years 3 --iterations 20 [--output compression.json]
+
+A seeded user's tracker pages, dashboard, chart JSON and CSV export are
+fetched once uncompressed. Each body is then compressed with gzip at
+several levels (and brotli, when installed) and the median time per body
+is reported with the bytes saved. "Break-even" is the link speed below
+which compressing is faster than sending the bytes saved, so anything
+clients reach over slower links than that gains from compression. The
+last column is the full request latency through ResponseCompression at
+the configured settings, against the same request without Accept-Encoding.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from app import create_app
+from app.compression import brotli, gzip_compressor
+from app.extensions import db
+from benchmarks.routes import BenchmarkConfig, _logged_in_client
+from benchmarks.seed import seed
+
+PAGES = [
+    ('weight.tracker', '/weight/tracker'),
+    ('fasting.tracker', '/fasting/tracker'),
+    ('main.dashboard', '/dashboard'),
+    ('weight.chart_data', '/weight/chart-data?range=all'),
+    ('data.export_data', '/data/export/weight.csv')
+]
+
+def _codecs():
+    codecs = [(f'gzip-{level}', lambda data, level=level: _gzip(data, level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        codecs += [(f'br-{quality}', lambda data, quality=quality: brotli.compress(data, quality=quality))
+                   for quality in (1, 4, 11)]
+    return codecs
+
+def _gzip(data, level):
+    compressor = gzip_compressor(level)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH)
+
+def _median_ms(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def run(years, iterations):
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    app = create_app(type('CompressionConfig', (BenchmarkConfig,), {'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + path}))
+    encoding = 'br' if brotli is not None else 'gzip'
+    results = []
+    try:
+        with app.app_context():
+            db.create_all()
+            user_id = seed(users=1, years=years)[0]
+
+        client = _logged_in_client(app, user_id)
+        for endpoint, url in PAGES:
+            body = client.get(url).get_data()  # Also warms caches and compiled templates
+            plain_ms = _median_ms(lambda: client.get(url).get_data(), iterations)
+            encoded_ms = _median_ms(lambda: client.get(url, headers={'Accept-Encoding': encoding}).get_data(),
+                                    iterations)
+            codecs = []
+            for name, compress in _codecs():
+                size = len(compress(body))
+                cpu_ms = _median_ms(lambda: compress(body), iterations)
+                saved = len(body) - size
+                codecs.append({
+                    'codec': name,
+                    'bytes': size,
+                    'ratio': round(size / len(body), 4) if body else 1.0,
+                    'cpu_ms': round(cpu_ms, 3),
+                    # Bytes saved per second of CPU spent, as a link speed in Mbit/s
+                    'break_even_mbps': round(saved * 8 / (cpu_ms / 1000) / 1e6, 1) if cpu_ms else None
+                })
+            results.append({
+                'route': endpoint,
+                'bytes': len(body),
+                'request_ms': round(plain_ms, 3),
+                'compressed_request_ms': round(encoded_ms, 3),
+                'codecs': codecs
+            })
+
+            print(f'{endpoint:<18} {len(body) / 1024:8.1f} KiB  request {plain_ms:7.2f} ms, '
+                  f'with {encoding} {encoded_ms:7.2f} ms', file=sys.stderr)
+            for codec in codecs:
+                print(f"    {codec['codec']:<8} {codec['bytes'] / 1024:8.1f} KiB  {codec['ratio']:6.1%}  "
+                      f"{codec['cpu_ms']:7.3f} ms  break-even {codec['break_even_mbps']} Mbit/s", file=sys.stderr)
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        os.remove(path)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--years', type=float, default=3, help='Years of seeded history for the user.')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed repetitions per page and codec.')
+    parser.add_argument('--output', help='Write results as JSON to this file.')
+    args = parser.parse_args(argv)
+
+    results = run(args.years, args.iterations)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'years': args.years, 'iterations': args.iterations, 'results': results}, output, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Concurrent-writer check for the SQLite engine profile.
+
+Usage::
+
+    python -m benchmarks.concurrency --threads 16 --writes 50 [--profile development]
+
+Starts THREADS threads that each log in as their own seeded user and POST
+WRITES weight and food entries through the Flask test client against one
+file-backed SQLite database. It exits non-zero if any request fails or if
+any row or daily_nutrition total is missing afterwards. Run it with
+--profile development to compare against the default rollback-journal setup.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from app import create_app
+from app.extensions import db
+from app.models import WeightEntry, CalorieEntry
+from app.calories.rollup import check_rollup
+from config import config_by_name
+from benchmarks.seed import seed
+from benchmarks.routes import _logged_in_client
+
+def _writer(app, user_id, writes, failures, barrier):
+    client = _logged_in_client(app, user_id)
+    barrier.wait()
+    for i in range(writes):
+        for url, data in (
+            ('/weight/tracker', {'weight': 70 + i % 10}),
+            ('/calories/calculator', {'food_name': 'Apple', 'calories': 95, 'meal_type': 'snack'})
+        ):
+            try:
+                response = client.post(url, data=data)
+                if response.status_code != 302:
+                    failures.append(f'{url} -> {response.status_code}')
+            except Exception as e:
+                failures.append(f'{url} -> {type(e).__name__}: {e}')
+
+def run(profile, threads, writes):
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    config = type('ConcurrencyConfig', (config_by_name[profile],), {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + path,
+        'WTF_CSRF_ENABLED': False,
+        'PROPAGATE_EXCEPTIONS': False
+    })
+    app = create_app(config)
+    try:
+        with app.app_context():
+            db.create_all()
+            user_ids = seed(users=threads, years=0)
+            before = WeightEntry.query.count(), CalorieEntry.query.count()
+
+        failures = []
+        barrier = threading.Barrier(threads)
+        workers = [threading.Thread(target=_writer, args=(app, user_id, writes, failures, barrier))
+                   for user_id in user_ids]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        with app.app_context():
+            written = (WeightEntry.query.count() - before[0], CalorieEntry.query.count() - before[1])
+            rollup_mismatches = len(check_rollup())
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    expected = threads * writes
+    print(f'{profile}: {threads} threads x {writes} writes x 2 routes in {elapsed:.2f}s, '
+          f'{len(failures)} failed requests, {written[0]}/{expected} weight and '
+          f'{written[1]}/{expected} food rows, {rollup_mismatches} rollup mismatches', file=sys.stderr)
+    for failure in failures[:10]:
+        print(f'  {failure}', file=sys.stderr)
+    return not failures and written == (expected, expected) and not rollup_mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--profile', default='production', choices=sorted(config_by_name))
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--writes', type=int, default=50, help='Weight and food entries posted per thread.')
+    args = parser.parse_args(argv)
+    return 0 if run(args.profile, args.threads, args.writes) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
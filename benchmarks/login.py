@@ -0,0 +1,107 @@
+"""Login throughput and latency under concurrency, with a probe of other requests.
+
+Usage::
+
+    python -m benchmarks.login --threads 32 --logins 5 [--server-threads 16 --workers 4 --max-pending 8]
+
+THREADS clients each sign in LOGINS times through the Flask test client
+while one probe client keeps requesting a cheap page. Every request first
+takes one of SERVER_THREADS slots, as on a gunicorn worker with that many
+--threads, so probe latency includes waiting for a free request thread.
+The report shows completed and refused (503) logins, login throughput, and
+login and probe latency. Compare runs with different --workers and
+--max-pending values to see how the hashing pool keeps a burst of logins
+from starving other requests.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from app import create_app
+from app.extensions import db
+from benchmarks.routes import BenchmarkConfig, _percentile
+from benchmarks.seed import seed, BENCHMARK_PASSWORD
+
+def _login_worker(app, server, username, logins, results, barrier):
+    client = app.test_client()
+    barrier.wait()
+    for _ in range(logins):
+        started = time.perf_counter()
+        with server:
+            response = client.post('/auth/login', data={'username': username, 'password': BENCHMARK_PASSWORD})
+        results.append((response.status_code, (time.perf_counter() - started) * 1000))
+        with server:
+            client.get('/auth/logout')
+
+def _probe(app, server, stop, latencies):
+    client = app.test_client()
+    while not stop.is_set():
+        started = time.perf_counter()
+        with server:
+            client.get('/auth/login')
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(0.01)
+
+def run(threads, logins, server_threads, workers, max_pending):
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    overrides = {'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + path, 'WORKER_THREADS': server_threads}
+    if workers:
+        overrides['PASSWORD_HASH_WORKERS'] = workers
+    if max_pending:
+        overrides['PASSWORD_HASH_MAX_PENDING'] = max_pending
+    app = create_app(type('LoginConfig', (BenchmarkConfig,), overrides))
+    try:
+        with app.app_context():
+            db.create_all()
+            user_ids = seed(users=threads, years=0, admin=False)
+
+        server = threading.BoundedSemaphore(server_threads)
+        results = []
+        probe_latencies = []
+        stop = threading.Event()
+        barrier = threading.Barrier(threads)
+        probe = threading.Thread(target=_probe, args=(app, server, stop, probe_latencies))
+        workers_ = [threading.Thread(target=_login_worker, args=(app, server, f'bench{user_id}', logins, results, barrier))
+                    for user_id in user_ids]
+        started = time.perf_counter()
+        probe.start()
+        for worker in workers_:
+            worker.start()
+        for worker in workers_:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        probe.join()
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        os.remove(path)
+
+    ok = [latency for status, latency in results if status == 302]
+    refused = sum(1 for status, _ in results if status == 503)
+    pool = app.extensions['password_hasher']
+    print(f'{threads} clients x {logins} logins on {server_threads} server threads, '
+          f'pool {pool.workers} workers / {pool.max_pending} pending: '
+          f'{len(ok)} ok, {refused} refused in {elapsed:.2f}s ({len(ok) / elapsed:.1f} logins/s)', file=sys.stderr)
+    if ok:
+        print(f'  login  p50 {_percentile(ok, 50):8.1f} ms  p95 {_percentile(ok, 95):8.1f} ms', file=sys.stderr)
+    if probe_latencies:
+        print(f'  probe  p50 {_percentile(probe_latencies, 50):8.1f} ms  p95 {_percentile(probe_latencies, 95):8.1f} ms',
+              file=sys.stderr)
+    return len(ok) + refused == threads * logins
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--logins', type=int, default=5, help='Logins per thread.')
+    parser.add_argument('--server-threads', type=int, default=16, help='Request threads, i.e. WORKER_THREADS.')
+    parser.add_argument('--workers', type=int, help='Override PASSWORD_HASH_WORKERS.')
+    parser.add_argument('--max-pending', type=int, help='Override PASSWORD_HASH_MAX_PENDING.')
+    args = parser.parse_args(argv)
+    return 0 if run(args.threads, args.logins, args.server_threads, args.workers, args.max_pending) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Per-route latency, query count and memory benchmark at several dataset sizes.
+
+Usage::
+
+    python -m benchmarks.routes --sizes 10:1,10:3,50:3 --iterations 20 \\
+        --output bench.json [--compare previous.json]
+
+Each size is USERS:YEARS. For every size a fresh SQLite database is seeded and
+each route is requested through the Flask test client as the first (admin)
+user. Results are written as JSON; with --compare the p95 latency and query
+count of each route are checked against an earlier run.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from config import Config
+from benchmarks.seed import seed
+
+ROUTES = [
+    ('weight.tracker', '/weight/tracker'),
+    ('calories.calculator', '/calories/calculator'),
+    ('fasting.tracker', '/fasting/tracker'),
+    ('main.dashboard', '/dashboard'),
+    ('admin.dashboard', '/admin/dashboard')
+]
+
+class BenchmarkConfig(Config):
+    WTF_CSRF_ENABLED = False
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def _logged_in_client(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+def run_size(users, years, iterations):
+    """Seed a fresh database and benchmark every route against it."""
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    config = type('SizedConfig', (BenchmarkConfig,), {'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + path})
+    app = create_app(config)
+    results = []
+    try:
+        with app.app_context():
+            db.create_all()
+            started = time.perf_counter()
+            user_ids = seed(users=users, years=years)
+            seed_seconds = time.perf_counter() - started
+
+            query_count = [0]
+
+            def count_query(*args):
+                query_count[0] += 1
+
+            event.listen(db.engine, 'before_cursor_execute', count_query)
+
+        client = _logged_in_client(app, user_ids[0])
+        for endpoint, url in ROUTES:
+            client.get(url)  # Warm up caches and compiled templates
+
+            timings = []
+            queries = []
+            status = None
+            for _ in range(iterations):
+                query_count[0] = 0
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+                queries.append(query_count[0])
+                status = response.status_code
+
+            # Measure memory separately since tracing slows requests down
+            tracemalloc.start()
+            client.get(url)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results.append({
+                'users': users,
+                'years': years,
+                'route': endpoint,
+                'status': status,
+                'p50_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(_percentile(timings, 95), 3),
+                'queries': max(queries),
+                'peak_memory_kib': round(peak / 1024, 1),
+                'seed_seconds': round(seed_seconds, 2)
+            })
+            print(f"{users:>5} users {years:>4}y  {endpoint:<22} p50 {results[-1]['p50_ms']:>9.2f} ms  "
+                  f"p95 {results[-1]['p95_ms']:>9.2f} ms  {results[-1]['queries']:>4} queries  "
+                  f"{results[-1]['peak_memory_kib']:>9.1f} KiB", file=sys.stderr)
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        os.remove(path)
+    return results
+
+def compare(results, baseline, tolerance):
+    """Return a description of each route that got slower or issues more queries than the baseline."""
+    previous = {(r['users'], r['years'], r['route']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get((result['users'], result['years'], result['route']))
+        if not before:
+            continue
+        if result['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{result['route']} at {result['users']}:{result['years']} p95 "
+                               f"{before['p95_ms']} -> {result['p95_ms']} ms")
+        if result['queries'] > before['queries']:
+            regressions.append(f"{result['route']} at {result['users']}:{result['years']} queries "
+                               f"{before['queries']} -> {result['queries']}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', default='10:1,10:3', help='Comma-separated USERS:YEARS dataset sizes.')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed requests per route.')
+    parser.add_argument('--output', help='Write results as JSON to this file.')
+    parser.add_argument('--compare', help='Earlier JSON results to check for regressions.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative p95 slowdown.')
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes.split(','):
+        users, years = size.split(':')
+        results.extend(run_size(int(users), float(years), args.iterations))
+
+    report = {
+        'created_at': datetime.utcnow().isoformat() + 'Z',
+        'python': platform.python_version(),
+        'iterations': args.iterations,
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION: {regression}', file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Fast bulk seeder that generates synthetic users with weight, calorie and fasting history."""
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app.extensions import db
+from app.models import User, WeightEntry, CalorieEntry, FastingSession
+from app.calories.rollup import rebuild_rollup
+from app.calories.catalog import rebuild_catalog
+from app.fasting.streaks import recompute_fasting_state
+from app.weight.forecast import recompute_forecast
+
+BENCHMARK_PASSWORD = 'benchmark'
+BATCH_SIZE = 10000
+
+FOODS = [
+    ('Oatmeal', 150, 5, 27, 3, 4), ('Eggs', 140, 12, 1, 10, 0), ('Chicken Breast', 165, 31, 0, 4, 0),
+    ('Rice', 205, 4, 45, 0, 1), ('Salad', 80, 2, 10, 4, 3), ('Apple', 95, 0, 25, 0, 4),
+    ('Salmon', 208, 20, 0, 13, 0), ('Pasta', 220, 8, 43, 1, 3), ('Yogurt', 100, 10, 6, 4, 0),
+    ('Banana', 105, 1, 27, 0, 3), ('Almonds', 160, 6, 6, 14, 3), ('Sandwich', 350, 18, 40, 12, 4)
+]
+MEALS = [('breakfast', 8), ('lunch', 13), ('dinner', 19), ('snack', 16)]
+
+def _insert_batches(model, rows):
+    """Insert generated rows with executemany in fixed-size batches."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.session.execute(insert(model), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(model), batch)
+
+def _weight_rows(rng, user_ids, start, days):
+    for user_id in user_ids:
+        weight = rng.uniform(70, 110)
+        drift = rng.uniform(-0.03, 0.01)
+        for day in range(days):
+            weight = min(max(weight + drift + rng.gauss(0, 0.3), 40), 250)
+            yield {
+                'user_id': user_id,
+                'weight': round(weight, 1),
+                'date': start + timedelta(days=day, hours=7, minutes=rng.randint(0, 59))
+            }
+
+def _calorie_rows(rng, user_ids, start, days):
+    for user_id in user_ids:
+        for day in range(days):
+            for meal_type, hour in MEALS:
+                if meal_type == 'snack' and rng.random() < 0.5:
+                    continue
+                name, calories, protein, carbs, fat, fiber = rng.choice(FOODS)
+                yield {
+                    'user_id': user_id,
+                    'food_name': name,
+                    'calories': calories,
+                    'meal_type': meal_type,
+                    'protein': protein,
+                    'carbs': carbs,
+                    'fat': fat,
+                    'fiber': fiber,
+                    'date': start + timedelta(days=day, hours=hour, minutes=rng.randint(0, 59))
+                }
+
+def _fasting_rows(rng, user_ids, start, days):
+    for user_id in user_ids:
+        day = 0
+        while day < days:
+            start_time = start + timedelta(days=day, hours=20, minutes=rng.randint(0, 59))
+            target_hours = rng.choice([16, 16, 18, 20, 24, None])
+            duration = rng.uniform(12, (target_hours or 16) + 4)
+            yield {
+                'user_id': user_id,
+                'start_time': start_time,
+                'end_time': start_time + timedelta(hours=duration),
+                'target_hours': target_hours,
+                'completed': True,
+                'duration_hours': duration
+            }
+            day += rng.choice([1, 1, 2, 3])
+
+def seed(users=10, years=1.0, seed_value=1234, admin=True):
+    """Create `users` users with `years` of daily history each and return their ids.
+
+    All rows are inserted with bulk executemany statements, and the derived
+    rollup, food catalog, streak and forecast tables are rebuilt afterwards.
+    The first user is an administrator when `admin` is true. Every user's
+    password is BENCHMARK_PASSWORD.
+    """
+    rng = random.Random(seed_value)
+    days = max(1, int(years * 365))
+    start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
+    password_hash = generate_password_hash(BENCHMARK_PASSWORD)
+
+    first_id = (db.session.query(db.func.max(User.id)).scalar() or 0) + 1
+    user_ids = list(range(first_id, first_id + users))
+    db.session.execute(insert(User), [{
+        'id': user_id,
+        'username': f'bench{user_id}',
+        'email': f'bench{user_id}@example.com',
+        'password_hash': password_hash,
+        'height': 175,
+        'is_admin': admin and index == 0,
+        'created_at': start,
+        'last_login': start + timedelta(days=rng.randint(0, days))
+    } for index, user_id in enumerate(user_ids)])
+
+    _insert_batches(WeightEntry, _weight_rows(rng, user_ids, start, days))
+    _insert_batches(CalorieEntry, _calorie_rows(rng, user_ids, start, days))
+    _insert_batches(FastingSession, _fasting_rows(rng, user_ids, start, days))
+
+    rebuild_rollup()
+    for user_id in user_ids:
+        rebuild_catalog(user_id)
+        recompute_fasting_state(user_id)
+        recompute_forecast(user_id)
+    db.session.commit()
+    return user_ids
@@ -0,0 +1,148 @@
+"""Cold-start benchmark: import time, create_app() time and each blueprint's first response.
+
+Usage::
+
+    python -m benchmarks.startup --runs 5 [--output startup.json]
+
+Every run is a fresh Python process, as a new or recycled worker would be.
+It imports the app, calls create_app() and then requests one page per
+blueprint once, so each first response includes compiling its templates.
+Runs are repeated with the Jinja bytecode cache disabled, empty (cold) and
+filled by `flask templates compile` (warm), and the medians are reported.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# One page per blueprint; auth is requested anonymously, the rest as the admin user
+PAGES = [
+    ('auth', '/auth/login'),
+    ('main', '/dashboard'),
+    ('weight', '/weight/tracker'),
+    ('calories', '/calories/calculator'),
+    ('fasting', '/fasting/tracker'),
+    ('admin', '/admin/dashboard'),
+    ('data', '/data/import')
+]
+MODES = ('no cache', 'cold cache', 'warm cache')
+
+def _startup_config(database_path, cache_dir):
+    from benchmarks.routes import BenchmarkConfig
+    return type('StartupConfig', (BenchmarkConfig,), {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + database_path,
+        'TEMPLATE_CACHE_DIR': cache_dir
+    })
+
+def measure(database_path, cache_dir, user_id):
+    """Runs in the child process; the timings start before the app is imported."""
+    started = time.perf_counter()
+    from app import create_app
+    imported = time.perf_counter()
+    config = _startup_config(database_path, cache_dir)
+    creating = time.perf_counter()
+    app = create_app(config)
+    created = time.perf_counter()
+
+    from benchmarks.routes import _logged_in_client
+    anonymous = app.test_client()
+    client = _logged_in_client(app, user_id)
+    first_response = {}
+    for blueprint, url in PAGES:
+        request_started = time.perf_counter()
+        response = (anonymous if blueprint == 'auth' else client).get(url)
+        first_response[blueprint] = (time.perf_counter() - request_started) * 1000
+        if response.status_code != 200:
+            raise SystemExit(f'{url} returned {response.status_code}')
+    return {
+        'import_ms': (imported - started) * 1000,
+        'create_app_ms': (created - creating) * 1000,
+        'first_response_ms': first_response
+    }
+
+def _run_child(database_path, cache_dir, user_id):
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.startup', '--child', database_path, cache_dir or '', str(user_id)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    result = json.loads(output)
+    result['process_ms'] = (time.perf_counter() - started) * 1000
+    return result
+
+def _prepare_database():
+    from app import create_app
+    from app.extensions import db
+    from benchmarks.seed import seed
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    app = create_app(_startup_config(path, None))
+    with app.app_context():
+        db.create_all()
+        user_id = seed(users=1, years=1)[0]
+        db.engine.dispose()
+    return path, user_id
+
+def _precompile(cache_dir):
+    from app import create_app
+    app = create_app(_startup_config(os.devnull, cache_dir))
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+def run(runs):
+    path, user_id = _prepare_database()
+    cache_dir = tempfile.mkdtemp(prefix='jinja-cache-')
+    results = {}
+    try:
+        for mode in MODES:
+            samples = []
+            for _ in range(runs):
+                if mode == 'cold cache':
+                    shutil.rmtree(cache_dir)
+                    os.makedirs(cache_dir)
+                elif mode == 'warm cache' and not os.listdir(cache_dir):
+                    _precompile(cache_dir)
+                samples.append(_run_child(path, None if mode == 'no cache' else cache_dir, user_id))
+            results[mode] = {
+                'process_ms': statistics.median(s['process_ms'] for s in samples),
+                'import_ms': statistics.median(s['import_ms'] for s in samples),
+                'create_app_ms': statistics.median(s['create_app_ms'] for s in samples),
+                'first_response_ms': {blueprint: statistics.median(s['first_response_ms'][blueprint] for s in samples)
+                                      for blueprint, _ in PAGES}
+            }
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        os.remove(path)
+
+    for mode, result in results.items():
+        first = result['first_response_ms']
+        print(f"{mode:<11} process {result['process_ms']:7.1f} ms  import {result['import_ms']:6.1f} ms  "
+              f"create_app {result['create_app_ms']:6.1f} ms  first responses {sum(first.values()):7.1f} ms", file=sys.stderr)
+        print('            ' + '  '.join(f'{blueprint} {ms:.1f}' for blueprint, ms in first.items()), file=sys.stderr)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='Fresh processes per cache mode.')
+    parser.add_argument('--output', help='Write results as JSON to this file.')
+    parser.add_argument('--child', nargs=3, metavar=('DATABASE', 'CACHE_DIR', 'USER_ID'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        database_path, cache_dir, user_id = args.child
+        print(json.dumps(measure(database_path, cache_dir or None, int(user_id))))
+        return 0
+
+    results = run(args.runs)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'runs': args.runs, 'results': results}, output, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
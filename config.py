@@ -9,4 +9,146 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    PERMANENT_SESSION_LIFETIME = timedelta(minutes=60)
\ No newline at end of file
+    PERMANENT_SESSION_LIFETIME = timedelta(minutes=60)
+
+    # Maximum number of points sent to the weight chart after downsampling
+    WEIGHT_CHART_MAX_POINTS = int(os.environ.get('WEIGHT_CHART_MAX_POINTS') or 500)
+
+    # Seconds a cached active fast is trusted before it is reloaded (bounds
+    # staleness across worker processes), and how many users' fasts are cached
+    FASTING_STATUS_CACHE_TTL = int(os.environ.get('FASTING_STATUS_CACHE_TTL') or 30)
+    FASTING_STATUS_CACHE_SIZE = int(os.environ.get('FASTING_STATUS_CACHE_SIZE') or 1024)
+    # Seconds between /fasting/status polls on the fasting tracker page
+    FASTING_POLL_INTERVAL = int(os.environ.get('FASTING_POLL_INTERVAL') or 10)
+
+    # Server-Sent Events instead of polling. Each open stream holds a worker
+    # thread, so only enable them with threaded or async workers (gunicorn
+    # gthread or gevent, see DEPLOYMENT.md). Streams end before gunicorn's
+    # default 30 s worker timeout and the browser reconnects
+    FASTING_STREAM_ENABLED = os.environ.get('FASTING_STREAM_ENABLED', '').lower() in ('1', 'true', 'yes')
+    FASTING_STREAM_POLL_INTERVAL = 1
+    FASTING_STREAM_TIMEOUT = int(os.environ.get('FASTING_STREAM_TIMEOUT') or 25)
+    FASTING_STREAM_MAX_PER_PROCESS = int(os.environ.get('FASTING_STREAM_MAX_PER_PROCESS') or 8)
+
+    # Per-request SQL timing: adds a Server-Timing header and logs statements
+    # slower than SLOW_QUERY_THRESHOLD_MS (to SLOW_QUERY_LOG if set)
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS') or 100)
+    SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG')
+
+    # Per-user dashboard cache; entries are also dropped whenever the user's data changes
+    DASHBOARD_CACHE_SIZE = int(os.environ.get('DASHBOARD_CACHE_SIZE') or 1024)
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL') or 300)
+
+    # CSV import: rows per INSERT/commit chunk and how many bad rows are listed in the report
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE') or 1000)
+    IMPORT_MAX_REPORTED_ERRORS = int(os.environ.get('IMPORT_MAX_REPORTED_ERRORS') or 100)
+
+    # Streaming export: rows fetched per cursor batch and bytes per response chunk
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE') or 1000)
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE') or 64 * 1024)
+
+    # Admin dashboard: seconds platform metrics are cached and days of per-day entry counts shown
+    ADMIN_METRICS_CACHE_TTL = int(os.environ.get('ADMIN_METRICS_CACHE_TTL') or 60)
+    ADMIN_METRICS_DAYS = int(os.environ.get('ADMIN_METRICS_DAYS') or 14)
+
+    # Rows per page (and per "Load more") in the weight, fasting and admin user lists
+    HISTORY_PAGE_SIZE = int(os.environ.get('HISTORY_PAGE_SIZE') or 25)
+
+    # Optional directory where compiled templates are cached across restarts and
+    # shared by all workers; `flask templates compile` fills it at deploy time
+    TEMPLATE_CACHE_DIR = os.environ.get('TEMPLATE_CACHE_DIR')
+
+    # gzip/brotli compression of pages and JSON: content type -> smallest body worth
+    # compressing; streamed bodies of these types are always compressed
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE') or 1024)
+    COMPRESSION_MIMETYPES = {
+        'text/html': COMPRESSION_MIN_SIZE,
+        'application/json': COMPRESSION_MIN_SIZE,
+        'text/csv': COMPRESSION_MIN_SIZE,
+        'application/x-ndjson': COMPRESSION_MIN_SIZE,
+        'text/plain': COMPRESSION_MIN_SIZE,
+        'text/css': COMPRESSION_MIN_SIZE,
+        'text/javascript': COMPRESSION_MIN_SIZE
+    }
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL') or 6)
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY') or 4)
+
+    # Fingerprinted, precompressed copies of app/static written by `flask assets build`;
+    # with no build there, static files are served unhashed as before
+    STATIC_BUILD_DIR = os.environ.get('STATIC_BUILD_DIR') or os.path.join(basedir, '.static_build')
+
+    # Weight trend: fraction of the gap to each new weight the smoothed trend closes
+    # per day, and the per-user cache of computed trend series
+    WEIGHT_TREND_SMOOTHING = float(os.environ.get('WEIGHT_TREND_SMOOTHING') or 0.1)
+    WEIGHT_TREND_CACHE_SIZE = int(os.environ.get('WEIGHT_TREND_CACHE_SIZE') or 1024)
+    WEIGHT_TREND_CACHE_TTL = int(os.environ.get('WEIGHT_TREND_CACHE_TTL') or 3600)
+
+    # Goal forecasts: days of recent entries the regression is fitted to, entries needed
+    # before a date is shown, and the z-score of the confidence band around it
+    WEIGHT_FORECAST_WINDOW_DAYS = int(os.environ.get('WEIGHT_FORECAST_WINDOW_DAYS') or 42)
+    WEIGHT_FORECAST_MIN_ENTRIES = int(os.environ.get('WEIGHT_FORECAST_MIN_ENTRIES') or 5)
+    WEIGHT_FORECAST_CONFIDENCE_Z = float(os.environ.get('WEIGHT_FORECAST_CONFIDENCE_Z') or 1.96)
+
+    # Maximum number of suggestions returned by the food-name autocomplete
+    FOOD_SEARCH_LIMIT = int(os.environ.get('FOOD_SEARCH_LIMIT') or 10)
+
+    # Cached login identities: per-process snapshots of the logged-in user. Changes made
+    # in another worker process become visible here within IDENTITY_CACHE_TTL seconds
+    IDENTITY_CACHE_SIZE = int(os.environ.get('IDENTITY_CACHE_SIZE') or 4096)
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL') or 30)
+
+    # Optional read replica for analytic queries wrapped in replica_reads(). A user's
+    # reads stay on the primary for REPLICA_READ_YOUR_WRITES_SECONDS after they write
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+    REPLICA_READ_YOUR_WRITES_SECONDS = int(os.environ.get('REPLICA_READ_YOUR_WRITES_SECONDS') or 10)
+
+    # Request threads per worker process: 1 for gunicorn's sync workers, otherwise
+    # its --threads value
+    WORKER_THREADS = int(os.environ.get('WORKER_THREADS') or 1)
+
+    # Password hashing: full werkzeug method string such as pbkdf2:sha256:600000 or
+    # scrypt:32768:8:1 (older hashes are upgraded on the next successful login), and
+    # the bounded pool it runs on. At most PASSWORD_HASH_MAX_PENDING logins hash or
+    # wait at once (default half of WORKER_THREADS, and always below it) so a burst
+    # can never hold every request thread; further logins get a 503, as do admitted
+    # ones still waiting after PASSWORD_HASH_TIMEOUT seconds
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'pbkdf2:sha256:600000'
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or os.cpu_count() or 2)
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING') or 0) or None
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT') or 2)
+
+    # PRAGMAs run on every new SQLite connection (see ProductionConfig)
+    SQLITE_PRAGMAS = {}
+
+class ProductionConfig(Config):
+    # WAL lets readers run alongside a writer, and busy_timeout makes writers
+    # queue for the lock instead of failing with "database is locked"
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS') or 5000),
+        'cache_size': -int(os.environ.get('SQLITE_CACHE_SIZE_KIB') or 64000),  # Negative means KiB
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE') or 268435456),
+        'temp_store': 'MEMORY'
+    }
+
+    # One pooled connection per worker thread, plus overflow for bursts
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('SQLALCHEMY_POOL_SIZE') or 8),
+        'max_overflow': int(os.environ.get('SQLALCHEMY_MAX_OVERFLOW') or 8),
+        'pool_timeout': 30
+    }
+    if Config.SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        # The sqlite3 timeout also covers the lock taken when a transaction begins
+        SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+            'check_same_thread': False
+        }
+
+config_by_name = {
+    'development': Config,
+    'production': ProductionConfig
+}
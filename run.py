@@ -1,8 +1,10 @@
+import os
 from app import create_app
 from app.models import User, WeightEntry, CalorieEntry
 from app.extensions import db
+from config import config_by_name
 
-app = create_app()
+app = create_app(config_by_name[os.environ.get('APP_CONFIG') or 'development'])
 
 @app.shell_context_processor
 def make_shell_context():
@@ -0,0 +1,69 @@
+import os
+from datetime import datetime, timedelta
+import pytest
+from flask_migrate import Migrate, upgrade
+from app import create_app
+from app.extensions import db
+from app.models import User, WeightEntry, WeightGoal, CalorieEntry, FastingSession
+from app.calories.catalog import rebuild_catalog
+from app.calories.rollup import rebuild_rollup
+from app.fasting.streaks import recompute_fasting_state
+from app.weight.forecast import recompute_forecast
+from config import Config
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+PASSWORD = 'password'
+
+class TestConfig(Config):
+    TESTING = True
+    WTF_CSRF_ENABLED = False
+    TEMPLATE_CACHE_DIR = None
+    STATIC_BUILD_DIR = None
+
+@pytest.fixture
+def app(tmp_path):
+    """An app on a fresh SQLite file built by running every migration."""
+    config = type('DatabaseConfig', (TestConfig,), {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "app.db"}'})
+    app = create_app(config)
+    Migrate(app, db, directory=MIGRATIONS)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def user_id(app):
+    """A user with a few weeks of weight, food and fasting history and an active goal and fast."""
+    now = datetime.utcnow()
+    with app.app_context():
+        user = User(username='alice', email='alice@example.com')
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.flush()
+        for day in range(30, 0, -1):
+            date = now - timedelta(days=day)
+            db.session.add(WeightEntry(user_id=user.id, weight=80 - day * 0.05, date=date))
+            db.session.add(CalorieEntry(user_id=user.id, food_name='Oatmeal', calories=350, meal_type='breakfast',
+                                        protein=12, carbs=60, fat=6, fiber=8, date=date))
+            db.session.add(FastingSession(user_id=user.id, start_time=date, end_time=date + timedelta(hours=16),
+                                          target_hours=16, completed=True, duration_hours=16))
+        db.session.add(FastingSession(user_id=user.id, start_time=now - timedelta(hours=2), target_hours=16))
+        db.session.add(WeightGoal(user_id=user.id, start_weight=80, target_weight=75, start_date=now - timedelta(days=30),
+                                  target_date=now + timedelta(days=60), goal_type='custom', active=True))
+        db.session.flush()
+        rebuild_rollup(user.id)
+        rebuild_catalog(user.id)
+        recompute_fasting_state(user.id)
+        recompute_forecast(user.id)
+        db.session.commit()
+        return user.id
+
+@pytest.fixture
+def client(app, user_id):
+    """A test client logged in as the seeded user."""
+    client = app.test_client()
+    response = client.post('/auth/login', data={'username': 'alice', 'password': PASSWORD})
+    assert response.status_code == 302
+    return client
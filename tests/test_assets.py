@@ -0,0 +1,63 @@
+import gzip
+import os
+import pytest
+from flask import url_for
+from app import create_app
+from app.assets import build_assets, IMMUTABLE_CACHE_CONTROL
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def build(tmp_path):
+    """Static files written to a tmp build directory, and an app serving them."""
+    build_dir = str(tmp_path / 'static')
+    static_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app', 'static')
+    manifest = build_assets(static_folder, build_dir)
+    app = create_app(type('AssetsConfig', (TestConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "app.db"}',
+        'STATIC_BUILD_DIR': build_dir
+    }))
+    return app, build_dir, manifest
+
+def test_build_writes_fingerprinted_files_and_compressed_variants(build):
+    _, build_dir, manifest = build
+    fingerprinted = manifest['js/weight_chart.js']
+    assert fingerprinted != 'js/weight_chart.js' and fingerprinted.endswith('.js')
+    assert os.path.isfile(os.path.join(build_dir, 'manifest.json'))
+    with open(os.path.join(build_dir, fingerprinted), 'rb') as original, \
+            gzip.open(os.path.join(build_dir, fingerprinted + '.gz')) as compressed:
+        assert compressed.read() == original.read()
+    # PNGs are already compressed, so no variant is built
+    assert not os.path.exists(os.path.join(build_dir, manifest['images/screen01.png'] + '.gz'))
+
+def test_url_for_emits_fingerprinted_names(build):
+    app, _, manifest = build
+    with app.test_request_context():
+        assert url_for('static', filename='js/weight_chart.js') == '/static/' + manifest['js/weight_chart.js']
+        assert url_for('static', filename='missing.js') == '/static/missing.js'
+
+def test_fingerprinted_files_are_immutable_and_precompressed(build):
+    app, build_dir, manifest = build
+    url = '/static/' + manifest['js/weight_chart.js']
+    client = app.test_client()
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.mimetype == 'text/javascript'
+    with open(os.path.join(build_dir, manifest['js/weight_chart.js'] + '.gz'), 'rb') as variant:
+        assert response.data == variant.read()
+    response.close()
+
+    response = client.get(url)
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+    response.close()
+
+def test_unfingerprinted_names_are_served_as_usual(build):
+    app, _, _ = build
+    response = app.test_client().get('/static/js/weight_chart.js')
+    assert response.status_code == 200
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
+    response.close()
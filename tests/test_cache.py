@@ -0,0 +1,30 @@
+from flask import Flask
+from app.cache import TTLCache, app_cache
+from app.identity import IdentityCache
+
+def _app():
+    app = Flask(__name__)
+    app.config.update(TEST_CACHE_SIZE=3, TEST_CACHE_TTL=60)
+    return app
+
+def test_app_cache_is_created_once_per_app():
+    first, second = _app(), _app()
+    with first.app_context():
+        cache = app_cache('test_cache', 'TEST_CACHE_SIZE', 'TEST_CACHE_TTL')
+        assert isinstance(cache, TTLCache)
+        assert (cache.maxsize, cache.ttl) == (3, 60)
+        assert app_cache('test_cache', 'TEST_CACHE_SIZE', 'TEST_CACHE_TTL') is cache
+    with second.app_context():
+        assert app_cache('test_cache', 'TEST_CACHE_SIZE', 'TEST_CACHE_TTL') is not cache
+
+def test_app_cache_without_a_size_holds_one_entry():
+    with _app().app_context():
+        cache = app_cache('test_cache', None, 'TEST_CACHE_TTL')
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert (cache.get('a'), cache.get('b')) == (None, 2)
+
+def test_app_cache_factory():
+    with _app().app_context():
+        assert isinstance(app_cache('test_cache', 'TEST_CACHE_SIZE', 'TEST_CACHE_TTL', factory=IdentityCache),
+                          IdentityCache)
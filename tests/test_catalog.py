@@ -0,0 +1,68 @@
+from app.extensions import db
+from app.calories.catalog import rebuild_catalog
+from app.models import CalorieEntry, FoodCatalog
+
+FOOD = {'calories': 100, 'meal_type': 'lunch', 'protein': 1, 'carbs': 2, 'fat': 3, 'fiber': 0}
+
+def _log(client, food_name, **values):
+    response = client.post('/calories/calculator', data=dict(FOOD, food_name=food_name, **values))
+    assert response.status_code == 302
+
+def _entry_id(app, user_id, food_name):
+    with app.app_context():
+        return CalorieEntry.query.filter_by(user_id=user_id, food_name=food_name)\
+            .order_by(CalorieEntry.id.desc()).first().id
+
+def _suggestions(client, query):
+    return [food['food_name'] for food in client.get(f'/calories/search?q={query}').json]
+
+def _catalog(app, user_id):
+    with app.app_context():
+        return sorted((food.name_key, food.food_name, food.calories, food.use_count, food.last_used_at)
+                      for food in FoodCatalog.query.filter_by(user_id=user_id))
+
+def _assert_matches_rebuild(app, user_id):
+    before = _catalog(app, user_id)
+    with app.app_context():
+        rebuild_catalog(user_id)
+        db.session.commit()
+    assert _catalog(app, user_id) == before
+
+def test_search_suggests_logged_foods_by_prefix(client):
+    _log(client, 'Chicken salad')
+    _log(client, 'Chickpeas')
+    assert set(_suggestions(client, 'chi')) == {'Chicken salad', 'Chickpeas'}
+    assert _suggestions(client, 'chickp') == ['Chickpeas']
+    assert _suggestions(client, '') == []
+
+def test_deleting_the_only_entry_drops_the_food(app, client, user_id):
+    _log(client, 'Chiken salad')
+    client.post(f'/calories/delete/{_entry_id(app, user_id, "Chiken salad")}')
+    assert _suggestions(client, 'chik') == []
+    _assert_matches_rebuild(app, user_id)
+
+def test_deleting_the_latest_use_falls_back_to_the_previous_values(app, client, user_id):
+    _log(client, 'Latte', calories=120)
+    _log(client, 'Latte', calories=190)
+    client.post(f'/calories/delete/{_entry_id(app, user_id, "Latte")}')
+    assert client.get('/calories/search?q=latte').json[0]['calories'] == 120
+    _assert_matches_rebuild(app, user_id)
+
+def test_renaming_moves_the_use_to_the_new_name(app, client, user_id):
+    _log(client, 'Bnana')
+    _log(client, 'Banana')
+    client.post(f'/calories/edit/{_entry_id(app, user_id, "Bnana")}',
+                data={'food_name': 'Banana', 'calories': 105, 'meal_type': 'snack'})
+    assert _suggestions(client, 'bn') == []
+    with app.app_context():
+        assert db.session.get(FoodCatalog, (user_id, 'banana')).use_count == 2
+    _assert_matches_rebuild(app, user_id)
+
+def test_editing_values_keeps_the_use_count(app, client, user_id):
+    _log(client, 'Soup')
+    client.post(f'/calories/edit/{_entry_id(app, user_id, "Soup")}',
+                data={'food_name': 'soup ', 'calories': 80, 'meal_type': 'dinner'})
+    with app.app_context():
+        food = db.session.get(FoodCatalog, (user_id, 'soup'))
+        assert (food.use_count, food.calories) == (1, 80)
+    _assert_matches_rebuild(app, user_id)
@@ -0,0 +1,106 @@
+import io
+import zlib
+import pytest
+from flask import Response, send_file
+from app import create_app
+from app.compression import brotli
+from tests.conftest import TestConfig
+
+MIN_SIZE = 1024
+BODY = 'x' * MIN_SIZE
+
+def _gunzip(data):
+    return zlib.decompress(data, 31)
+
+@pytest.fixture
+def compressing_app(tmp_path):
+    """An app with a few bare routes covering the cases ResponseCompression must leave alone."""
+    config = type('CompressionConfig', (TestConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "app.db"}',
+        # Event streams are listed here only to show they are skipped anyway
+        'COMPRESSION_MIMETYPES': {'text/plain': MIN_SIZE, 'text/event-stream': 0}
+    })
+    app = create_app(config)
+
+    @app.route('/test/text/<int:size>')
+    def text(size):
+        return Response('x' * size, mimetype='text/plain')
+
+    @app.route('/test/chunks')
+    def chunks():
+        return Response((f'chunk {i}\n' for i in range(3)), mimetype='text/plain')
+
+    @app.route('/test/events')
+    def events():
+        return Response(iter(['data: 1\n\n']), mimetype='text/event-stream')
+
+    @app.route('/test/encoded')
+    def encoded():
+        return Response(zlib.compress(BODY.encode(), 0), mimetype='text/plain', headers={'Content-Encoding': 'deflate'})
+
+    @app.route('/test/file')
+    def file():
+        return send_file(io.BytesIO(BODY.encode()), mimetype='text/plain')
+
+    @app.route('/test/not-modified')
+    def not_modified():
+        response = Response(BODY, status=304, mimetype='text/plain')
+        response.set_etag('strong')
+        return response
+
+    return app
+
+def test_best_accepted_encoding_is_used(compressing_app):
+    client = compressing_app.test_client()
+    response = client.get(f'/test/text/{MIN_SIZE}', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert _gunzip(response.data) == BODY.encode()
+
+    response = client.get(f'/test/text/{MIN_SIZE}', headers={'Accept-Encoding': 'gzip;q=0.5, br'})
+    assert response.headers['Content-Encoding'] == ('br' if brotli is not None else 'gzip')
+
+    response = client.get(f'/test/text/{MIN_SIZE}', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+def test_bodies_below_the_minimum_size_are_sent_as_is(compressing_app):
+    client = compressing_app.test_client()
+    response = client.get(f'/test/text/{MIN_SIZE - 1}', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == b'x' * (MIN_SIZE - 1)
+
+def test_generator_responses_stay_streamed(compressing_app):
+    client = compressing_app.test_client()
+    response = client.get('/test/chunks', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    # The first chunk decodes on its own, before the generator has finished
+    decompressor = zlib.decompressobj(31)
+    assert decompressor.decompress(next(iter(response.response))) == b'chunk 0\n'
+    response.close()
+
+@pytest.mark.parametrize('url', ['/test/events', '/test/encoded', '/test/file', '/test/not-modified'])
+def test_pass_through_responses(compressing_app, url):
+    client = compressing_app.test_client()
+    plain = client.get(url)
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers.get('Content-Encoding') == plain.headers.get('Content-Encoding')
+    assert response.headers.get('ETag') == plain.headers.get('ETag')
+    assert response.data == plain.data
+
+def test_streamed_export_is_compressed(client):
+    plain = client.get('/data/export/weight.csv').data
+    response = client.get('/data/export/weight.csv', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert _gunzip(response.data) == plain
+
+def test_chart_data_revalidates_against_the_weak_etag(client):
+    response = client.get('/weight/chart-data?range=30d', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+
+    response = client.get('/weight/chart-data?range=30d', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
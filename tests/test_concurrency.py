@@ -0,0 +1,75 @@
+import threading
+import pytest
+from flask_migrate import Migrate, upgrade
+from sqlalchemy import func, text
+from app import create_app
+from app.extensions import db
+from app.calories.rollup import check_rollup
+from app.models import User, WeightEntry, CalorieEntry, DailyNutrition
+from config import ProductionConfig
+from tests.conftest import MIGRATIONS, TestConfig
+
+THREADS = 8
+WRITES = 10
+
+@pytest.fixture
+def production_app(tmp_path):
+    """An app with the production SQLite pragmas and pool on a fresh file."""
+    config = type('ConcurrencyConfig', (TestConfig, ProductionConfig), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "app.db"}',
+        'PROPAGATE_EXCEPTIONS': False
+    })
+    app = create_app(config)
+    Migrate(app, db, directory=MIGRATIONS)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+def _writer(app, user_id, failures, barrier):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    barrier.wait()
+    for i in range(WRITES):
+        for url, data in (
+            ('/weight/tracker', {'weight': 70 + i}),
+            ('/calories/calculator', {'food_name': 'Apple', 'calories': 95, 'meal_type': 'snack'})
+        ):
+            try:
+                response = client.post(url, data=data)
+                if response.status_code != 302:
+                    failures.append(f'{url} -> {response.status_code}')
+            except Exception as e:
+                failures.append(f'{url} -> {type(e).__name__}: {e}')
+
+def test_concurrent_writers_with_production_pragmas(production_app):
+    with production_app.app_context():
+        assert db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        users = [User(username=f'writer{i}', email=f'writer{i}@example.com') for i in range(THREADS)]
+        for user in users:
+            user.password_hash = 'unused'
+        db.session.add_all(users)
+        db.session.commit()
+        user_ids = [user.id for user in users]
+
+    failures = []
+    barrier = threading.Barrier(THREADS)
+    writers = [threading.Thread(target=_writer, args=(production_app, user_id, failures, barrier))
+               for user_id in user_ids]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    assert failures == []
+    with production_app.app_context():
+        for user_id in user_ids:
+            assert WeightEntry.query.filter_by(user_id=user_id).count() == WRITES
+            assert CalorieEntry.query.filter_by(user_id=user_id).count() == WRITES
+            calories = db.session.query(func.sum(DailyNutrition.calories)).filter_by(user_id=user_id).scalar()
+            assert calories == 95 * WRITES
+        assert check_rollup() == []
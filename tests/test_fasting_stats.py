@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db
+from app.models import FastingSession
+from app.fasting.routes import calculate_fasting_stats
+
+def _reference_stats(user_id):
+    """The stats computed in Python from FastingSession.duration, as the page did before the SQL aggregates."""
+    sessions = FastingSession.query.filter_by(user_id=user_id, completed=True).order_by(FastingSession.id).all()
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    month_ago = datetime.utcnow() - timedelta(days=30)
+    weekly = [s for s in sessions if s.start_time >= week_ago]
+    monthly = [s for s in sessions if s.start_time >= month_ago]
+    total_hours = sum(s.duration for s in sessions)
+    return {
+        'total_fasts': len(sessions),
+        'total_hours': total_hours,
+        'avg_duration': total_hours / len(sessions),
+        'longest_fast': max(sessions, key=lambda s: s.duration),  # First of any tie
+        'success_rate': len([s for s in sessions if s.target_hours is None or s.duration >= s.target_hours])
+                        / len(sessions) * 100,
+        'weekly_hours': sum(s.duration for s in weekly),
+        'monthly_hours': sum(s.duration for s in monthly),
+        'weekly_sessions': len(weekly),
+        'monthly_sessions': len(monthly)
+    }
+
+def test_stats_match_the_reference(app, user_id):
+    now = datetime.utcnow()
+    with app.app_context():
+        for days_ago, hours, target in [
+            (2, 20, None),   # No target: always counts as a success
+            (3, 12.5, 16),   # Missed its target
+            (5, 20, 18),     # Ties the first 20h fast for the longest
+            (45, 14, None),  # Outside the monthly window
+            (60, 18, 20)
+        ]:
+            start = now - timedelta(days=days_ago, hours=1)
+            session = FastingSession(user_id=user_id, start_time=start, target_hours=target)
+            session.finish(start + timedelta(hours=hours))
+            db.session.add(session)
+        db.session.commit()
+
+        stats = calculate_fasting_stats(user_id)
+        reference = _reference_stats(user_id)
+        assert stats['longest_fast'].id == reference.pop('longest_fast').id
+        assert stats.pop('longest_fast').duration == 20
+        assert stats == {key: pytest.approx(value) for key, value in reference.items()}
+        assert stats['success_rate'] < 100
+
+def test_no_completed_fasts(app):
+    with app.app_context():
+        assert calculate_fasting_stats(1) is None
@@ -0,0 +1,30 @@
+import pytest
+from app.extensions import db
+from app.models import WeightEntry, WeightForecast
+from app.weight.forecast import recompute_forecast
+
+def _assert_matches_rebuild(app, user_id):
+    # sum_t and the other time sums depend on the origin, which a rebuild resets
+    with app.app_context():
+        state = db.session.get(WeightForecast, user_id)
+        kept = state.last_date, state.count, state.sum_w, state.sum_ww
+        rebuilt = recompute_forecast(user_id)
+        assert kept == (rebuilt.last_date, rebuilt.count, pytest.approx(rebuilt.sum_w), pytest.approx(rebuilt.sum_ww))
+        db.session.rollback()
+
+def _entry_ids(app, user_id):
+    with app.app_context():
+        return [entry.id for entry in WeightEntry.query.filter_by(user_id=user_id).order_by(WeightEntry.date)]
+
+@pytest.mark.parametrize('position', [-1, 10])
+def test_deleting_an_entry_keeps_the_forecast_in_step(app, user_id, client, position):
+    entry_id = _entry_ids(app, user_id)[position]
+    assert client.post(f'/weight/delete/{entry_id}').status_code == 302
+    _assert_matches_rebuild(app, user_id)
+
+def test_deleting_the_latest_entry_moves_the_window_back(app, user_id, client):
+    *_, previous_id, latest_id = _entry_ids(app, user_id)
+    client.post(f'/weight/delete/{latest_id}')
+    with app.app_context():
+        state = db.session.get(WeightForecast, user_id)
+        assert state.last_date == db.session.get(WeightEntry, previous_id).date
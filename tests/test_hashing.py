@@ -0,0 +1,30 @@
+import threading
+import pytest
+from flask import Flask
+from app.hashing import PasswordHasher, PasswordHashingBusy, _HashingPool
+
+def _pool(**config):
+    app = Flask(__name__)
+    app.config.update({'PASSWORD_HASH_WORKERS': 1, 'PASSWORD_HASH_MAX_PENDING': None, 'PASSWORD_HASH_TIMEOUT': 2,
+                       **config})
+    PasswordHasher(app)
+    return app.extensions['password_hasher']
+
+def test_max_pending_defaults_to_half_the_request_threads():
+    assert _pool(WORKER_THREADS=16).max_pending == 8
+    assert _pool(WORKER_THREADS=1).max_pending == 1
+
+def test_max_pending_is_kept_below_the_request_threads():
+    assert _pool(WORKER_THREADS=16, PASSWORD_HASH_MAX_PENDING=32).max_pending == 15
+    assert _pool(WORKER_THREADS=16, PASSWORD_HASH_MAX_PENDING=4).max_pending == 4
+
+def test_full_pool_refuses_and_slow_hash_times_out():
+    pool = _HashingPool(workers=1, max_pending=1, timeout=0.1)
+    release = threading.Event()
+    with pytest.raises(PasswordHashingBusy):
+        pool.run(release.wait)  # Admitted, but still running when the wait times out
+    with pytest.raises(PasswordHashingBusy):
+        pool.run(lambda: None)  # The slot is held until the running hash finishes
+    release.set()
+    pool.executor.shutdown(wait=True)
+    assert pool.slots.acquire(blocking=False)
@@ -0,0 +1,70 @@
+import io
+import pytest
+from app.extensions import db
+from app.calories.rollup import check_rollup
+from app.data.importer import import_csv, ImportFileError
+from app.models import WeightEntry, FastingSession, DailyNutrition, FoodCatalog, WeightForecast
+
+def _import(app, kind, text, user_id, **kwargs):
+    with app.app_context():
+        return import_csv(io.StringIO(text), kind, user_id, **kwargs)
+
+def test_weight_import_skips_invalid_rows(app, user_id):
+    result = _import(app, 'weight', 'date,weight\n'
+                                    '2020-01-01,80.5\n'
+                                    'not a date,80\n'
+                                    '2020-01-02,nan\n'
+                                    '2020-01-03,1000\n'
+                                    '2020-01-04 07:30,79.9\n', user_id)
+    assert result.imported == 2
+    assert [line for line, _ in result.errors] == [3, 4, 5]
+    with app.app_context():
+        assert WeightEntry.query.filter(WeightEntry.user_id == user_id, WeightEntry.date < '2021-01-01').count() == 2
+        assert db.session.get(WeightForecast, user_id).count > 0
+
+def test_calorie_import_updates_rollup_and_catalog(app, user_id):
+    result = _import(app, 'calories', 'date,food_name,calories,meal_type,protein,carbs,fat,fiber\n'
+                                      '2020-01-01 08:00,Banana,105,breakfast,1,27,0,3\n'
+                                      '2020-01-01 12:00,Banana,105,lunch,1,27,0,3\n'
+                                      '2020-01-01 13:00,Soup,-5,lunch,1,1,1,1\n', user_id, batch_size=1)
+    assert result.imported == 2
+    assert result.error_count == 1
+    with app.app_context():
+        day = DailyNutrition.query.filter_by(user_id=user_id).filter(DailyNutrition.day < '2021-01-01').one()
+        assert (day.calories, day.entry_count) == (210, 2)
+        assert db.session.get(FoodCatalog, (user_id, 'banana')).use_count == 2
+        assert check_rollup(user_id) == []
+
+@pytest.mark.parametrize('target_hours', ['inf', '-inf', 'nan', '16.5', '0', '505', 'abc'])
+def test_fasting_import_reports_bad_target_hours(app, user_id, target_hours):
+    result = _import(app, 'fasting', 'start_time,end_time,target_hours\n'
+                                     '2020-01-01 20:00,2020-01-02 12:00,16\n'
+                                     f'2020-01-02 20:00,2020-01-03 12:00,{target_hours}\n', user_id)
+    assert result.imported == 1
+    assert result.errors[0][0] == 3
+    assert result.errors[0][1].startswith('target_hours:')
+
+def test_fasting_import_accepts_whole_and_missing_targets(app, user_id):
+    result = _import(app, 'fasting', 'start_time,end_time,target_hours\n'
+                                     '2020-01-01 20:00,2020-01-02 12:00,16.0\n'
+                                     '2020-01-02 20:00,2020-01-03 12:00,\n'
+                                     '2020-01-03 20:00,2020-01-03 19:00,16\n', user_id)
+    assert result.imported == 2
+    assert result.errors[0][0] == 4
+    with app.app_context():
+        imported = FastingSession.query.filter(FastingSession.user_id == user_id,
+                                               FastingSession.start_time < '2021-01-01') \
+            .order_by(FastingSession.start_time).all()
+        assert [session.target_hours for session in imported] == [16, None]
+        assert imported[0].duration_hours == pytest.approx(16)
+
+def test_missing_columns_reject_the_file(app, user_id):
+    with pytest.raises(ImportFileError):
+        _import(app, 'weight', 'day,kg\n2020-01-01,80\n', user_id)
+
+def test_import_route_reports_invalid_target_hours(client):
+    data = {'kind': 'fasting', 'file': (io.BytesIO(b'start_time,end_time,target_hours\n'
+                                                   b'2020-01-01 20:00,2020-01-02 12:00,inf\n'), 'fasts.csv')}
+    response = client.post('/data/import', data=data, content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert b'skipped 1 invalid rows' in response.data
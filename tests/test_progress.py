@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from app.weight.progress import (SECONDS_PER_DAY, timestamp, first_index_from, last_index_at, window_change,
+                                 window_rate, goal_projection, goal_weight_at)
+
+def _series(*points):
+    """Parallel (times, values) lists from (day, value) pairs."""
+    return [day * SECONDS_PER_DAY for day, _ in points], [value for _, value in points]
+
+def test_timestamp_is_naive_utc():
+    assert timestamp(datetime(1970, 1, 2)) == SECONDS_PER_DAY
+
+@pytest.mark.parametrize('times, values', [([], []), _series((0, 80.0))])
+def test_windows_of_empty_and_single_point_histories_are_zero(times, values):
+    assert window_change(times, values, 7) == 0
+    assert window_rate(times, values, 7) == 0
+
+def test_index_lookups():
+    times, _ = _series((0, 0), (2, 0), (2, 0), (5, 0))
+    assert first_index_from(times, 2 * SECONDS_PER_DAY) == 1
+    assert first_index_from(times, 6 * SECONDS_PER_DAY) == 4
+    assert last_index_at(times, 2 * SECONDS_PER_DAY) == 2
+    assert last_index_at(times, 4 * SECONDS_PER_DAY) == 2
+    # Earlier than every point: clamps to the first one
+    assert last_index_at(times, -SECONDS_PER_DAY) == 0
+    assert last_index_at([], 0) == 0
+
+def test_window_starts_at_last_point_at_or_before_its_start():
+    times, values = _series((0, 90.0), (3, 89.0), (7, 88.0), (10, 87.5), (14, 86.0))
+    assert window_change(times, values, 7) == pytest.approx(86.0 - 88.0)
+    assert window_change(times, values, 5) == pytest.approx(86.0 - 88.0)
+    assert window_rate(times, values, 7) == pytest.approx(-2.0)
+
+def test_history_shorter_than_window_uses_its_first_point():
+    times, values = _series((0, 80.0), (2, 79.0), (4, 78.0))
+    assert window_change(times, values, 30) == pytest.approx(-2.0)
+    assert window_rate(times, values, 30) == pytest.approx(-2.0 / 4 * 7)
+    assert window_rate(times, values, 30, per_days=1) == pytest.approx(-0.5)
+
+def test_rate_of_points_on_the_same_instant_is_zero():
+    times, values = [0.0, 0.0], [80.0, 79.0]
+    assert window_change(times, values, 7) == pytest.approx(-1.0)
+    assert window_rate(times, values, 7) == 0
+
+def test_goal_projection_interpolates_between_start_and_target():
+    assert goal_projection(0, 80.0, 10, 70.0, 0) == 80.0
+    assert goal_projection(0, 80.0, 10, 70.0, 5) == pytest.approx(75.0)
+    assert goal_projection(0, 80.0, 10, 70.0, 10) == 70.0
+
+def test_goal_projection_is_clipped_before_start_and_after_target():
+    assert goal_projection(0, 80.0, 10, 70.0, -5) == 80.0
+    assert goal_projection(0, 80.0, 10, 70.0, 25) == 70.0
+    # A weight-gain goal clips the same way
+    assert goal_projection(0, 60.0, 10, 65.0, -1) == 60.0
+    assert goal_projection(0, 60.0, 10, 65.0, 11) == 65.0
+
+def test_goal_weight_at_uses_the_goal_dates():
+    start = datetime(2026, 1, 1)
+    goal = SimpleNamespace(start_date=start, start_weight=90.0, target_date=start + timedelta(days=100),
+                           target_weight=80.0)
+    assert goal_weight_at(goal, start - timedelta(days=1)) == 90.0
+    assert goal_weight_at(goal, start + timedelta(days=25)) == pytest.approx(87.5)
+    assert goal_weight_at(goal, start + timedelta(days=200)) == 80.0
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+
+# The per-user pages of the weight, calories, main and fasting blueprints
+ROUTES = [
+    '/weight/tracker',
+    '/weight/chart-data?range=all',
+    '/weight/history',
+    '/calories/calculator',
+    '/calories/search?q=oat',
+    '/dashboard',
+    '/fasting/tracker',
+    '/fasting/status',
+    '/fasting/history'
+]
+
+def _full_scans(plan):
+    # SQLite reports a full table (or full index) walk as "SCAN <table>";
+    # "SEARCH" means an index narrowed the rows
+    return [detail for detail in plan if detail.startswith('SCAN') and detail != 'SCAN CONSTANT ROW']
+
+@pytest.mark.parametrize('url', ROUTES)
+def test_route_queries_use_indexes(app, client, url):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+    assert response.status_code == 200
+    assert statements, f'{url} ran no queries'
+
+    with app.app_context(), db.engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = [row[3] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+            assert not _full_scans(plan), f'{url} runs a full scan: {" ".join(statement.split())}\n{plan}'
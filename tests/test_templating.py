@@ -0,0 +1,38 @@
+import logging
+import shutil
+import pytest
+from flask import render_template_string
+from app import create_app
+from app.templating import _SafeBytecodeCache
+from tests.conftest import TestConfig
+
+@pytest.fixture(autouse=True)
+def app_logger(monkeypatch):
+    # Running the migrations in other tests applies alembic.ini, which disables existing loggers
+    monkeypatch.setattr(logging.getLogger('app'), 'disabled', False)
+
+def _app(cache_dir):
+    return create_app(type('TemplateCacheConfig', (TestConfig,), {'TEMPLATE_CACHE_DIR': cache_dir}))
+
+def test_cache_is_off_unless_configured():
+    assert _app(None).jinja_env.bytecode_cache is None
+
+def test_unusable_cache_dir_falls_back_with_a_warning(tmp_path, caplog):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    with caplog.at_level(logging.WARNING):
+        app = _app(str(blocker / 'templates'))
+    assert app.jinja_env.bytecode_cache is None
+    assert 'Template cache disabled' in caplog.text
+    with app.test_request_context():
+        assert app.jinja_env.get_template('auth/login.html')
+
+def test_failed_cache_write_does_not_break_rendering(tmp_path, caplog):
+    cache_dir = tmp_path / 'templates'
+    app = _app(str(cache_dir))
+    assert isinstance(app.jinja_env.bytecode_cache, _SafeBytecodeCache)
+    shutil.rmtree(cache_dir)
+    with app.app_context(), caplog.at_level(logging.WARNING):
+        assert render_template_string('{{ 1 + 1 }}') == '2'
+        assert app.jinja_env.get_template('auth/login.html')
+    assert 'Could not write to the template cache' in caplog.text